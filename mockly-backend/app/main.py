@@ -1,21 +1,22 @@
+import asyncio
+import contextlib
 import os
-import sys
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+import orjson
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import FileResponse, ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-# Ensure project root is importable before pulling in app.routes.* modules.
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
+from .routes.routes_questions import router as questions_router
+from .routes.routes_feedback import router as feedback_router
+from .routes.routes_webrtc import router as webrtc_router
+from .routes.routes_execute import router as execute_router, warm_runtimes
+from .routes.routes_audio import router as audio_router
+from .services.workflow import router as workflow_router
+from .services.workflow.config import CORS_ALLOW_ORIGINS, LIVE_TRANSCRIPTION_PATH
 
-from app.routes.routes_questions import router as questions_router
-from app.routes.routes_feedback import router as feedback_router
-from app.routes.routes_webrtc import router as webrtc_router
-from app.routes.routes_execute import router as execute_router
-from app.routes.routes_audio import router as audio_router
-from app.services.workflow import router as workflow_router
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 # Try to import the optional standalone workflow app. In some runtime
 # environments (e.g., the Docker image) the top-level `workflow`
@@ -29,17 +30,138 @@ except Exception as _e:  # pragma: no cover - runtime diagnostic
     workflow_import_error = str(_e)
 
 
-app = FastAPI(title="Mockly", version="0.1.0")
+class FastCORSMiddleware:
+    """Static CORS policy with every header precomputed at startup.
+
+    Our policy never changes at runtime (configured origins, any
+    method/header), so instead of Starlette's CORSMiddleware rebuilding
+    allow-list strings per request we cache the header tuples as bytes and
+    append them to ``http.response.start``. Preflights are answered directly.
+    """
+
+    ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+    MAX_AGE = b"600"
+
+    def __init__(self, app: ASGIApp, allow_origins: list[str] | None = None) -> None:
+        self.app = app
+        origins = CORS_ALLOW_ORIGINS if allow_origins is None else allow_origins
+        # Listed origins are echoed back with credentials allowed; any other
+        # origin under `*` gets the bare wildcard and never credentials.
+        self._allow_any = "*" in origins
+        self._wildcard = ((b"access-control-allow-origin", b"*"),)
+        self._common = ((b"access-control-allow-credentials", b"true"),)
+        self._headers = {
+            origin.encode("latin-1"): ((b"access-control-allow-origin", origin.encode("latin-1")), *self._common)
+            for origin in origins
+            if origin != "*"
+        }
+        self._preflight_rejected = (
+            b"Disallowed CORS origin",
+            [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", b"22"), (b"vary", b"Origin")],
+        )
+
+    def _headers_for(self, origin: bytes) -> tuple[tuple[bytes, bytes], ...] | None:
+        headers = self._headers.get(origin)
+        if headers is None and self._allow_any:
+            headers = self._wildcard
+        return headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = self._headers_for(origin)
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(send, cors_headers, request_headers)
+            return
+
+        if cors_headers is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Echoed origins make the response vary by Origin; the wildcard doesn't.
+        vary_origin = cors_headers is not self._wildcard
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.extend(cors_headers)
+                if vary_origin:
+                    _add_vary_origin(headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(
+        self,
+        send: Send,
+        cors_headers: tuple[tuple[bytes, bytes], ...] | None,
+        request_headers: bytes | None,
+    ) -> None:
+        if cors_headers is None:
+            body, headers = self._preflight_rejected
+            status = 400
+        else:
+            body = b"OK"
+            headers = [
+                *cors_headers,
+                (b"access-control-allow-methods", self.ALLOW_METHODS),
+                (b"access-control-max-age", self.MAX_AGE),
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", b"2"),
+            ]
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+            if cors_headers is not self._wildcard:
+                headers.append((b"vary", b"Origin"))
+            status = 200
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def _add_vary_origin(headers: list[tuple[bytes, bytes]]) -> None:
+    """Add Origin to the response's Vary header, merging with one the app set."""
+    for i, (key, value) in enumerate(headers):
+        if key.lower() == b"vary":
+            tokens = [token.strip().lower() for token in value.split(b",")]
+            if b"origin" not in tokens and b"*" not in tokens:
+                headers[i] = (key, value + b", Origin")
+            return
+    headers.append((b"vary", b"Origin"))
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Warm the code-runner toolchains in the background so startup isn't held up.
+    warmup = None
+    if os.getenv("EXEC_WARMUP", "1") == "1":
+        warmup = asyncio.create_task(warm_runtimes())
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
 
 
-# Allow local dev frontends; tighten in production
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app = FastAPI(title="Mockly", version="0.1.0", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+
+# Allow the configured frontends (CORS_ALLOW_ORIGINS in .env; "*" when unset).
+app.add_middleware(FastCORSMiddleware)
 
 
 app.include_router(questions_router)
@@ -59,9 +181,9 @@ else:
     # Provide a lightweight fallback endpoint under /assistant/debug/claude/stream
     # which uses the internal ChatbotAgent. This avoids relying on the
     # optional top-level `workflow` package being present in the image.
-    from fastapi import Body, Response
-    from app.services.chatbot.agent import ChatbotAgent
-    from app.services.chatbot.prompts import load_question_by_difficulty
+    from fastapi import Body
+    from .services.chatbot.agent import ChatbotAgent
+    from .services.chatbot.prompts import load_question_by_difficulty
 
     agent = ChatbotAgent()
 
@@ -88,13 +210,8 @@ else:
             return Response(content=f"Error: {e}", media_type="text/plain; charset=utf-8", status_code=500)
 
 
-@app.get("/assistant/_info")
-def assistant_info():
-    """Diagnostic endpoint to confirm the mounted workflow app and list its routes.
-
-    This helps debug 404s by returning whether the workflow module was
-    imported correctly and which paths it exposes.
-    """
+def _describe_workflow_app(include_methods: bool) -> dict:
+    """Summarize the mounted workflow app and its routes for diagnostics."""
     try:
         subapp = getattr(workflow_api, "app", None)
         if subapp is None:
@@ -102,7 +219,10 @@ def assistant_info():
         routes = []
         for r in getattr(subapp, "routes", []):
             try:
-                routes.append({"path": getattr(r, "path", str(r)), "name": getattr(r, "name", None)})
+                route = {"path": getattr(r, "path", None) or str(r), "name": getattr(r, "name", None)}
+                if include_methods:
+                    route["methods"] = sorted(r.methods) if getattr(r, "methods", None) else []
+                routes.append(route)
             except Exception:
                 routes.append({"repr": repr(r)})
         return {"mounted": True, "routes_count": len(routes), "routes": routes}
@@ -110,33 +230,22 @@ def assistant_info():
         return {"mounted": False, "error": str(e)}
 
 
-@app.get("/_assistant_info")
-def assistant_info_root():
-    """Root-level diagnostic that lists the mounted workflow app routes.
+# Diagnostic endpoints that list the mounted workflow app routes. The sub-app
+# is fixed after import, so the payloads are serialized once; they are only
+# registered when MOCKLY_DEBUG=1 so production routing never sees them.
+if os.getenv("MOCKLY_DEBUG", "0") == "1":
+    _ASSISTANT_INFO_JSON = orjson.dumps(_describe_workflow_app(include_methods=False))
+    _ASSISTANT_INFO_ROOT_JSON = orjson.dumps(_describe_workflow_app(include_methods=True))
 
-    This endpoint deliberately avoids the /assistant mount prefix so it
-    is handled by the main app and not forwarded to the sub-application.
-    """
-    try:
-        subapp = getattr(workflow_api, "app", None)
-        if subapp is None:
-            return {"mounted": False, "reason": "workflow.api.app not found"}
-        routes = []
-        for r in getattr(subapp, "routes", []):
-            try:
-                methods = []
-                if hasattr(r, "methods") and r.methods:
-                    methods = sorted(list(r.methods))
-                routes.append({
-                    "path": getattr(r, "path", None) or str(r),
-                    "name": getattr(r, "name", None),
-                    "methods": methods,
-                })
-            except Exception:
-                routes.append({"repr": repr(r)})
-        return {"mounted": True, "routes_count": len(routes), "routes": routes}
-    except Exception as e:
-        return {"mounted": False, "error": str(e)}
+    @app.get("/assistant/_info")
+    def assistant_info():
+        """Confirm the workflow app is mounted and list its routes (helps debug 404s)."""
+        return Response(content=_ASSISTANT_INFO_JSON, media_type="application/json")
+
+    @app.get("/_assistant_info")
+    def assistant_info_root():
+        """Same listing with methods, served outside the /assistant mount prefix."""
+        return Response(content=_ASSISTANT_INFO_ROOT_JSON, media_type="application/json")
 
 
 @app.get("/")
@@ -149,12 +258,8 @@ async def get_live_transcription():
     """
     Serve the live transcription JSON file generated by the workflow system.
     """
-    from fastapi.responses import FileResponse
-    from pathlib import Path
-    
     # Get the transcription path from workflow config
     try:
-        from app.services.workflow.config import LIVE_TRANSCRIPTION_PATH
         if not LIVE_TRANSCRIPTION_PATH:
             raise HTTPException(status_code=404, detail="Live transcription not enabled")
         
@@ -178,10 +283,27 @@ async def get_live_transcription():
 if __name__ == "__main__":
     import uvicorn
 
+    # uvloop/httptools ship with uvicorn[standard]; fall back to the pure
+    # Python implementations if the wheels are unavailable on this platform.
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
     # Allow overriding host/port/reload via env for local dev.
     uvicorn.run(
         "app.main:app",
         host=os.getenv("HOST", "0.0.0.0"),
         port=int(os.getenv("PORT", "8000")),
         reload=os.getenv("UVICORN_RELOAD", "0") == "1",
+        loop=loop,
+        http=http,
+        log_level=os.getenv("UVICORN_LOG_LEVEL", "warning"),
+        access_log=os.getenv("UVICORN_ACCESS_LOG", "0") == "1",
     )
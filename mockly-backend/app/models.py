@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Literal, Optional, List, Dict
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # --- Questions ---
@@ -24,6 +24,8 @@ class ExecuteRequest(BaseModel):
     source: str
     stdin: Optional[str] = None
     timeoutMs: Optional[int] = None
+    # Below ~32 MiB most runtimes can't even map their own segments.
+    memoryLimitMb: Optional[int] = Field(default=None, ge=32)
 
 
 class ExecuteResponse(BaseModel):
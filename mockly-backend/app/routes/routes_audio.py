@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import re
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import AsyncIterator, Optional
 
+import anyio
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 
 router = APIRouter(prefix="/api", tags=["audio"])
@@ -13,33 +13,55 @@ router = APIRouter(prefix="/api", tags=["audio"])
 
 AUDIO_PATH = Path(__file__).resolve().parent.parent / "assets" / "audio.mp3"
 CHUNK_SIZE = 1024 * 64  # 64 KiB chunks keep latency low without spamming the event loop.
-RANGE_PATTERN = re.compile(r"bytes=(\d+)-(\d*)")
 
+# The demo track is static for the process lifetime, so stat it once and
+# derive a strong validator for conditional requests.
+AUDIO_STAT = AUDIO_PATH.stat() if AUDIO_PATH.exists() else None
+AUDIO_SIZE: Optional[int] = AUDIO_STAT.st_size if AUDIO_STAT else None
+AUDIO_ETAG: Optional[str] = f'"{AUDIO_STAT.st_mtime_ns:x}-{AUDIO_STAT.st_size:x}"' if AUDIO_STAT else None
+CACHE_HEADERS = {"ETag": AUDIO_ETAG or "", "Cache-Control": "public, max-age=3600"}
 
-def _iter_file(start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
-    with AUDIO_PATH.open("rb") as stream:
-        stream.seek(start)
-        remaining = None if end is None else (end - start + 1)
 
-        while True:
-            read_size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
-            chunk = stream.read(read_size)
+async def _iter_file(start: int, end: int) -> AsyncIterator[bytes]:
+    async with await anyio.open_file(AUDIO_PATH, "rb") as stream:
+        await stream.seek(start)
+        remaining = end - start + 1
+
+        while remaining > 0:
+            chunk = await stream.read(min(CHUNK_SIZE, remaining))
             if not chunk:
                 break
             yield chunk
-            if remaining is not None:
-                remaining -= len(chunk)
-                if remaining <= 0:
-                    break
+            remaining -= len(chunk)
+
+
+def _etag_matches(if_none_match: Optional[str]) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2): "*" or any listed
+    # tag equal to ours once a W/ prefix is dropped counts as a match.
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == AUDIO_ETAG:
+            return True
+    return False
 
 
 def _parse_range(range_header: str, file_size: int) -> tuple[int, int]:
-    match = RANGE_PATTERN.match(range_header)
-    if not match:
+    # Accepts "bytes=<start>-[<end>]" (anything after the end digits, e.g. a
+    # second range, is ignored); other forms fall back to the whole file.
+    if not range_header.startswith("bytes="):
         return 0, file_size - 1
+    start_text, sep, rest = range_header[6:].partition("-")
+    if not sep or not start_text.isdecimal():
+        return 0, file_size - 1
+
+    end_len = 0
+    while end_len < len(rest) and rest[end_len].isdecimal():
+        end_len += 1
 
-    start = int(match.group(1))
-    end = int(match.group(2)) if match.group(2) else file_size - 1
+    start = int(start_text)
+    end = int(rest[:end_len]) if end_len else file_size - 1
 
     if start >= file_size:
         raise HTTPException(
@@ -65,10 +87,13 @@ async def stream_audio(request: Request):
     Streams the demo audio track with basic Range request support so the frontend
     can progressively download or seek within the file.
     """
-    if not AUDIO_PATH.exists():
+    if AUDIO_SIZE is None:
         raise HTTPException(status_code=404, detail="Audio asset is not available.")
 
-    file_size = AUDIO_PATH.stat().st_size
+    if _etag_matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=CACHE_HEADERS)
+
+    file_size = AUDIO_SIZE
     range_header = request.headers.get("range")
 
     if range_header:
@@ -77,6 +102,7 @@ async def stream_audio(request: Request):
             "Content-Range": f"bytes {start}-{end}/{file_size}",
             "Accept-Ranges": "bytes",
             "Content-Length": str(end - start + 1),
+            **CACHE_HEADERS,
         }
         return StreamingResponse(
             _iter_file(start, end),
@@ -85,12 +111,11 @@ async def stream_audio(request: Request):
             headers=headers,
         )
 
-    headers = {
-        "Accept-Ranges": "bytes",
-        "Content-Length": str(file_size),
-    }
-    return StreamingResponse(
-        _iter_file(),
+    # Full-file responses go through FileResponse, which uses sendfile when
+    # the server supports it.
+    return FileResponse(
+        AUDIO_PATH,
         media_type="audio/mpeg",
-        headers=headers,
+        headers={"Accept-Ranges": "bytes", **CACHE_HEADERS},
+        stat_result=AUDIO_STAT,
     )
@@ -1,9 +1,24 @@
+import asyncio
+import atexit
+import contextlib
+import hashlib
+import math
+import os
+import queue
+import shutil
 import subprocess
 import tempfile
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Union
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+import anyio
 from fastapi import APIRouter
 
 from ..models import ExecuteRequest, ExecuteResponse
@@ -12,78 +27,304 @@ from ..models import ExecuteRequest, ExecuteResponse
 router = APIRouter(prefix="/api", tags=["execute"])
 
 
-EXEC_ROOT = Path(".runner")
+# Point EXEC_ROOT at a tmpfs (e.g. /dev/shm/mockly-runner) to keep scratch
+# sources and compiled binaries off the container's overlay filesystem.
+EXEC_ROOT = Path(os.getenv("EXEC_ROOT", ".runner"))
 EXEC_ROOT.mkdir(parents=True, exist_ok=True)
 
 
-# Simple "write file and run interpreter" commands.
+# Simple "write file and run interpreter" commands: the source path is
+# spliced between a static prefix and suffix.
 TS_COMPILER_OPTIONS = '{"module":"commonjs","moduleResolution":"node"}'
 
 
-INTERPRETED_COMMANDS: Dict[str, Dict[str, List[str]]] = {
-    "python": {"extension": ".py", "cmd": ["python3", "{file}"]},
-    "javascript": {"extension": ".js", "cmd": ["node", "{file}"]},
+INTERPRETED_COMMANDS: Dict[str, Dict] = {
+    "python": {"extension": ".py", "prefix": ("python3",), "suffix": ()},
+    "javascript": {"extension": ".js", "prefix": ("node",), "suffix": ()},
     "typescript": {
         "extension": ".ts",
-        "cmd": [
-            "ts-node",
-            "--transpile-only",
-            "--compiler-options",
-            '{"module":"commonjs","moduleResolution":"node"}',
-            "{file}",
-        ],
+        "prefix": ("ts-node", "--transpile-only", "--compiler-options", TS_COMPILER_OPTIONS),
+        "suffix": (),
     },
-    "perl": {"extension": ".pl", "cmd": ["perl", "{file}"]},
-    "ruby": {"extension": ".rb", "cmd": ["ruby", "{file}"]},
+    "perl": {"extension": ".pl", "prefix": ("perl",), "suffix": ()},
+    "ruby": {"extension": ".rb", "prefix": ("ruby",), "suffix": ()},
 }
 
 DEFAULT_TIMEOUT_SECONDS = 5.0
 
+# Cap what we capture and echo back so runaway output can't exhaust server
+# memory or balloon the JSON response.
+MAX_OUTPUT_BYTES = 256 * 1024
+
+# Optional address-space cap (MiB) for the program run step; requests may
+# lower it (or set one when unset) with memoryLimitMb but never raise it.
+# Unset by default because JVM/V8/Go reserve large virtual ranges up front.
+DEFAULT_MEMORY_LIMIT_MB = int(os.getenv("EXEC_MEMORY_LIMIT_MB", "0")) or None
+
+
+# Reusable scratch directories so each run doesn't pay for a mkdir/rmdir pair.
+# When every workspace is busy we fall back to a fresh one and drop it again
+# if the pool is already full on return.
+WORKSPACE_POOL_SIZE = int(os.getenv("EXEC_WORKSPACE_POOL_SIZE", "8"))
+_WORKSPACES: "queue.Queue[Path]" = queue.Queue(maxsize=WORKSPACE_POOL_SIZE)
+for _ in range(WORKSPACE_POOL_SIZE):
+    _WORKSPACES.put_nowait(Path(tempfile.mkdtemp(dir=EXEC_ROOT)))
+
+
+@atexit.register
+def _drain_workspaces() -> None:
+    while True:
+        try:
+            shutil.rmtree(_WORKSPACES.get_nowait(), ignore_errors=True)
+        except queue.Empty:
+            return
+
+
+def _clear_workspace(workspace: Path) -> None:
+    with os.scandir(workspace) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+def _release_workspace(workspace: Path) -> None:
+    try:
+        _clear_workspace(workspace)
+        _WORKSPACES.put_nowait(workspace)
+    except (OSError, queue.Full):
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+@asynccontextmanager
+async def _workspace() -> AsyncIterator[Path]:
+    # Directory creation and cleanup touch the filesystem, so they run in a
+    # worker thread rather than on the event loop.
+    try:
+        workspace = _WORKSPACES.get_nowait()
+    except queue.Empty:
+        workspace = Path(await asyncio.to_thread(tempfile.mkdtemp, dir=EXEC_ROOT))
+    try:
+        yield workspace
+    finally:
+        await asyncio.to_thread(_release_workspace, workspace)
+
+
+# Compiled C/C++/Java builds keyed by a hash of (language, source) so re-running
+# unchanged code skips the compiler; least recently used entries are evicted
+# past EXEC_BUILD_CACHE_SIZE (0 disables the cache).
+BUILD_CACHE_DIR = EXEC_ROOT / "build-cache"
+BUILD_CACHE_MAX_ENTRIES = int(os.getenv("EXEC_BUILD_CACHE_SIZE", "200"))
+BUILD_CACHE_DIR.mkdir(exist_ok=True)
 
-def _run_process(
+
+def _build_key(language: str, source: str) -> str:
+    return hashlib.blake2b(f"{language}\0{source}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _checkout_build(key: str, dest: Path, pattern: str) -> bool:
+    """Link a cached build's artifacts into ``dest``; False on a cache miss.
+
+    Programs always run from the request's own workspace, so evicting the
+    cache entry mid-run can't pull files out from under them.
+    """
+    if BUILD_CACHE_MAX_ENTRIES <= 0:
+        return False
+    build_dir = BUILD_CACHE_DIR / key
+    try:
+        os.utime(build_dir)  # mark as recently used for eviction
+        artifacts = list(build_dir.glob(pattern))
+        for artifact in artifacts:
+            try:
+                os.link(artifact, dest / artifact.name)
+            except OSError:
+                shutil.copy2(artifact, dest / artifact.name)
+    except OSError:
+        return False  # missing, or evicted while linking; just rebuild
+    return bool(artifacts)
+
+
+def _store_build(key: str, src_dir: Path, pattern: str) -> None:
+    """Copy compiled artifacts from ``src_dir`` into the cache."""
+    if BUILD_CACHE_MAX_ENTRIES <= 0:
+        return
+    try:
+        staging = Path(tempfile.mkdtemp(dir=BUILD_CACHE_DIR, prefix=".staging-"))
+    except OSError:
+        return
+    try:
+        for artifact in src_dir.glob(pattern):
+            shutil.copy2(artifact, staging / artifact.name)
+        # Publishing by rename is atomic; losing a race to an identical
+        # concurrent build leaves the other copy in place.
+        os.replace(staging, BUILD_CACHE_DIR / key)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        return
+    _evict_builds()
+
+
+def _evict_builds() -> None:
+    try:
+        with os.scandir(BUILD_CACHE_DIR) as it:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in it if not entry.name.startswith(".")]
+    except OSError:
+        return
+    excess = len(entries) - BUILD_CACHE_MAX_ENTRIES
+    if excess > 0:
+        entries.sort()
+        for _, path in entries[:excess]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _limits_preexec(timeout: float, memory_limit_mb: Optional[int]):
+    """Build a preexec_fn applying CPU (and optionally address-space) rlimits."""
+    if resource is None:
+        return None
+    cpu_seconds = math.ceil(timeout) + 1
+
+    def apply_limits() -> None:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+        if memory_limit_mb:
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    return apply_limits
+
+
+async def _feed_stdin(stdin: asyncio.StreamWriter, data: Optional[bytes]) -> None:
+    try:
+        if data:
+            stdin.write(data)
+            await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        stdin.close()
+
+
+async def _read_capped(stream: asyncio.StreamReader, buf: bytearray, proc) -> None:
+    # Keep at most one byte past the cap so _decode can flag the truncation,
+    # and stop the child once it has produced more than we'll ever return.
+    while True:
+        chunk = await stream.read(64 * 1024)
+        if not chunk:
+            return
+        buf += chunk[: MAX_OUTPUT_BYTES + 1 - len(buf)]
+        if len(buf) > MAX_OUTPUT_BYTES:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            return
+
+
+async def _run_process(
     cmd: List[str],
     stdin_bytes: Optional[bytes],
     timeout: float,
+    memory_limit_mb: Optional[int] = None,
 ) -> subprocess.CompletedProcess:
-    return subprocess.run(
-        cmd,
-        input=stdin_bytes,
-        capture_output=True,
-        timeout=timeout,
+    """Run ``cmd`` without blocking the event loop.
+
+    Mirrors ``subprocess.run(capture_output=True, timeout=...)``: returns a
+    CompletedProcess and raises ``subprocess.TimeoutExpired`` (with whatever
+    output was captured) after killing the child when it overruns
+    ``timeout``. Output is capped at MAX_OUTPUT_BYTES per stream and the
+    child runs under CPU / memory rlimits.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        preexec_fn=_limits_preexec(timeout, memory_limit_mb),
     )
+    stdout, stderr = bytearray(), bytearray()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _feed_stdin(proc.stdin, stdin_bytes),
+                _read_capped(proc.stdout, stdout, proc),
+                _read_capped(proc.stderr, stderr, proc),
+                proc.wait(),
+            ),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr) from None
+    # Hand the capture buffers over as-is; _decode reads them without copying.
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+# One cheap invocation per toolchain pulls its binaries into the page cache
+# (and lets ts-node/V8 JIT once) so the first real run isn't the cold one.
+WARMUP_COMMANDS = (
+    ("python3", "-c", "0"),
+    ("node", "-e", "0"),
+    ("ts-node", "-e", "0"),
+    ("gcc", "--version"),
+    ("g++", "--version"),
+    ("javac", "-version"),
+)
+
+
+async def warm_runtimes() -> None:
+    async def run(cmd) -> None:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+        except OSError:
+            return  # Toolchain not installed; /api/execute reports it per request.
+        try:
+            await asyncio.wait_for(proc.wait(), 30)
+        except asyncio.TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()
+
+    await asyncio.gather(*(run(cmd) for cmd in WARMUP_COMMANDS))
 
 
 @router.post("/execute", response_model=ExecuteResponse)
-def execute_code(payload: ExecuteRequest) -> ExecuteResponse:
+async def execute_code(payload: ExecuteRequest) -> ExecuteResponse:
     timeout = (
         max(payload.timeoutMs, 1) / 1000 if payload.timeoutMs else DEFAULT_TIMEOUT_SECONDS
     )
+    if DEFAULT_MEMORY_LIMIT_MB is not None:
+        payload.memoryLimitMb = min(payload.memoryLimitMb or DEFAULT_MEMORY_LIMIT_MB, DEFAULT_MEMORY_LIMIT_MB)
 
-    with tempfile.TemporaryDirectory(dir=EXEC_ROOT) as tmp_dir:
-        stdin_bytes = payload.stdin.encode() if payload.stdin else None
-        started = time.perf_counter()
+    async with _workspace() as tmp_dir:
+        stdin_bytes = payload.stdin.encode("utf-8") if payload.stdin else b""
+        started = time.perf_counter_ns()
 
         config = INTERPRETED_COMMANDS.get(payload.language)
         if config:
-            return _run_interpreted(config, payload, stdin_bytes, timeout, tmp_dir, started)
+            return await _run_interpreted(config, payload, stdin_bytes, timeout, tmp_dir, started)
 
         if payload.language == "cpp":
-            return _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started)
+            return await _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started)
 
         if payload.language == "java":
-            return _run_java(payload, stdin_bytes, timeout, tmp_dir, started)
+            return await _run_java(payload, stdin_bytes, timeout, tmp_dir, started)
 
         if payload.language == "c":
-            return _run_c(payload, stdin_bytes, timeout, tmp_dir, started)
+            return await _run_c(payload, stdin_bytes, timeout, tmp_dir, started)
 
         if payload.language == "csharp":
-            return _run_csharp(payload, stdin_bytes, timeout, tmp_dir, started)
+            return await _run_csharp(payload, stdin_bytes, timeout, tmp_dir, started)
 
         if payload.language == "kotlin":
-            return _run_kotlin(payload, stdin_bytes, timeout, tmp_dir, started)
+            return await _run_kotlin(payload, stdin_bytes, timeout, tmp_dir, started)
 
         if payload.language == "go":
-            return _run_go(payload, stdin_bytes, timeout, tmp_dir, started)
+            return await _run_go(payload, stdin_bytes, timeout, tmp_dir, started)
 
         return ExecuteResponse(
             stdout="",
@@ -92,15 +333,12 @@ def execute_code(payload: ExecuteRequest) -> ExecuteResponse:
         )
 
 
-def _run_interpreted(config, payload, stdin_bytes, timeout, tmp_dir, started):
-    source_path = Path(tmp_dir) / f"Main{config['extension']}"
-    source_path.write_text(payload.source)
-    cmd = [
-        arg.format(file=str(source_path)) if "{file}" in arg else arg
-        for arg in config["cmd"]
-    ]
+async def _run_interpreted(config, payload, stdin_bytes, timeout, tmp_dir, started):
+    source_path = tmp_dir / f"Main{config['extension']}"
+    await anyio.Path(source_path).write_text(payload.source)
+    cmd = [*config["prefix"], str(source_path), *config["suffix"]]
     try:
-        proc = _run_process(cmd, stdin_bytes, timeout)
+        proc = await _run_process(cmd, stdin_bytes, timeout, payload.memoryLimitMb)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -110,19 +348,19 @@ def _run_interpreted(config, payload, stdin_bytes, timeout, tmp_dir, started):
     except subprocess.TimeoutExpired as exc:
         return _timeout_response(exc, timeout)
 
-    duration_ms = int((time.perf_counter() - started) * 1000)
+    duration_ms = (time.perf_counter_ns() - started) // 1_000_000
     return ExecuteResponse(
-        stdout=proc.stdout.decode("utf-8", errors="replace"),
-        stderr=proc.stderr.decode("utf-8", errors="replace"),
+        stdout=_decode(proc.stdout),
+        stderr=_decode(proc.stderr),
         exitCode=proc.returncode,
         timeMs=duration_ms,
     )
 
 
-def _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started):
-    source_path = Path(tmp_dir) / "main.cpp"
-    exe_path = Path(tmp_dir) / "main.bin"
-    source_path.write_text(payload.source)
+async def _compile_cpp(payload, timeout, tmp_dir) -> Optional[ExecuteResponse]:
+    source_path = tmp_dir / "main.cpp"
+    exe_path = tmp_dir / "main.bin"
+    await anyio.Path(source_path).write_text(payload.source)
 
     compile_cmd = [
         "g++",
@@ -134,7 +372,7 @@ def _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started):
         str(exe_path),
     ]
     try:
-        compile_proc = _run_process(compile_cmd, None, timeout)
+        compile_proc = await _run_process(compile_cmd, None, timeout)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -143,8 +381,8 @@ def _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started):
         )
     if compile_proc.returncode != 0:
         return ExecuteResponse(
-            stdout=compile_proc.stdout.decode("utf-8", errors="replace"),
-            stderr=compile_proc.stderr.decode("utf-8", errors="replace"),
+            stdout=_decode(compile_proc.stdout),
+            stderr=_decode(compile_proc.stderr),
             exitCode=compile_proc.returncode,
         )
 
@@ -157,9 +395,20 @@ def _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started):
             stderr="C++ runner failed to produce an executable binary.",
             exitCode=1,
         )
+    return None
+
+
+async def _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started):
+    build_key = _build_key("cpp", payload.source)
+    if not await asyncio.to_thread(_checkout_build, build_key, tmp_dir, "main.bin"):
+        failure = await _compile_cpp(payload, timeout, tmp_dir)
+        if failure is not None:
+            return failure
+        await asyncio.to_thread(_store_build, build_key, tmp_dir, "main.bin")
+    exe_path = tmp_dir / "main.bin"
 
     try:
-        run_proc = _run_process([str(exe_path)], stdin_bytes, timeout)
+        run_proc = await _run_process([str(exe_path)], stdin_bytes, timeout, payload.memoryLimitMb)
     except subprocess.TimeoutExpired as exc:
         return _timeout_response(exc, timeout)
     except PermissionError:
@@ -175,22 +424,22 @@ def _run_cpp(payload, stdin_bytes, timeout, tmp_dir, started):
             exitCode=1,
         )
 
-    duration_ms = int((time.perf_counter() - started) * 1000)
+    duration_ms = (time.perf_counter_ns() - started) // 1_000_000
     return ExecuteResponse(
-        stdout=run_proc.stdout.decode("utf-8", errors="replace"),
-        stderr=run_proc.stderr.decode("utf-8", errors="replace"),
+        stdout=_decode(run_proc.stdout),
+        stderr=_decode(run_proc.stderr),
         exitCode=run_proc.returncode,
         timeMs=duration_ms,
     )
 
 
-def _run_java(payload, stdin_bytes, timeout, tmp_dir, started):
-    source_path = Path(tmp_dir) / "Main.java"
-    source_path.write_text(payload.source)
+async def _compile_java(payload, timeout, tmp_dir) -> Optional[ExecuteResponse]:
+    source_path = tmp_dir / "Main.java"
+    await anyio.Path(source_path).write_text(payload.source)
 
     compile_cmd = ["javac", str(source_path)]
     try:
-        compile_proc = _run_process(compile_cmd, None, timeout)
+        compile_proc = await _run_process(compile_cmd, None, timeout)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -199,14 +448,24 @@ def _run_java(payload, stdin_bytes, timeout, tmp_dir, started):
         )
     if compile_proc.returncode != 0:
         return ExecuteResponse(
-            stdout=compile_proc.stdout.decode("utf-8", errors="replace"),
-            stderr=compile_proc.stderr.decode("utf-8", errors="replace"),
+            stdout=_decode(compile_proc.stdout),
+            stderr=_decode(compile_proc.stderr),
             exitCode=compile_proc.returncode,
         )
+    return None
+
+
+async def _run_java(payload, stdin_bytes, timeout, tmp_dir, started):
+    build_key = _build_key("java", payload.source)
+    if not await asyncio.to_thread(_checkout_build, build_key, tmp_dir, "*.class"):
+        failure = await _compile_java(payload, timeout, tmp_dir)
+        if failure is not None:
+            return failure
+        await asyncio.to_thread(_store_build, build_key, tmp_dir, "*.class")
 
     run_cmd = ["java", "-cp", str(tmp_dir), "Main"]
     try:
-        run_proc = _run_process(run_cmd, stdin_bytes, timeout)
+        run_proc = await _run_process(run_cmd, stdin_bytes, timeout, payload.memoryLimitMb)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -216,19 +475,19 @@ def _run_java(payload, stdin_bytes, timeout, tmp_dir, started):
     except subprocess.TimeoutExpired as exc:
         return _timeout_response(exc, timeout)
 
-    duration_ms = int((time.perf_counter() - started) * 1000)
+    duration_ms = (time.perf_counter_ns() - started) // 1_000_000
     return ExecuteResponse(
-        stdout=run_proc.stdout.decode("utf-8", errors="replace"),
-        stderr=run_proc.stderr.decode("utf-8", errors="replace"),
+        stdout=_decode(run_proc.stdout),
+        stderr=_decode(run_proc.stderr),
         exitCode=run_proc.returncode,
         timeMs=duration_ms,
     )
 
 
-def _run_c(payload, stdin_bytes, timeout, tmp_dir, started):
-    source_path = Path(tmp_dir) / "main.c"
-    exe_path = Path(tmp_dir) / "main.bin"
-    source_path.write_text(payload.source)
+async def _compile_c(payload, timeout, tmp_dir) -> Optional[ExecuteResponse]:
+    source_path = tmp_dir / "main.c"
+    exe_path = tmp_dir / "main.bin"
+    await anyio.Path(source_path).write_text(payload.source)
 
     compile_cmd = [
         "gcc",
@@ -240,7 +499,7 @@ def _run_c(payload, stdin_bytes, timeout, tmp_dir, started):
         str(exe_path),
     ]
     try:
-        compile_proc = _run_process(compile_cmd, None, timeout)
+        compile_proc = await _run_process(compile_cmd, None, timeout)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -249,8 +508,8 @@ def _run_c(payload, stdin_bytes, timeout, tmp_dir, started):
         )
     if compile_proc.returncode != 0:
         return ExecuteResponse(
-            stdout=compile_proc.stdout.decode("utf-8", errors="replace"),
-            stderr=compile_proc.stderr.decode("utf-8", errors="replace"),
+            stdout=_decode(compile_proc.stdout),
+            stderr=_decode(compile_proc.stderr),
             exitCode=compile_proc.returncode,
         )
 
@@ -262,9 +521,20 @@ def _run_c(payload, stdin_bytes, timeout, tmp_dir, started):
             stderr="C runner failed to produce an executable binary.",
             exitCode=1,
         )
+    return None
+
+
+async def _run_c(payload, stdin_bytes, timeout, tmp_dir, started):
+    build_key = _build_key("c", payload.source)
+    if not await asyncio.to_thread(_checkout_build, build_key, tmp_dir, "main.bin"):
+        failure = await _compile_c(payload, timeout, tmp_dir)
+        if failure is not None:
+            return failure
+        await asyncio.to_thread(_store_build, build_key, tmp_dir, "main.bin")
+    exe_path = tmp_dir / "main.bin"
 
     try:
-        run_proc = _run_process([str(exe_path)], stdin_bytes, timeout)
+        run_proc = await _run_process([str(exe_path)], stdin_bytes, timeout, payload.memoryLimitMb)
     except subprocess.TimeoutExpired as exc:
         return _timeout_response(exc, timeout)
     except PermissionError:
@@ -280,34 +550,36 @@ def _run_c(payload, stdin_bytes, timeout, tmp_dir, started):
             exitCode=1,
         )
 
-    duration_ms = int((time.perf_counter() - started) * 1000)
+    duration_ms = (time.perf_counter_ns() - started) // 1_000_000
     return ExecuteResponse(
-        stdout=run_proc.stdout.decode("utf-8", errors="replace"),
-        stderr=run_proc.stderr.decode("utf-8", errors="replace"),
+        stdout=_decode(run_proc.stdout),
+        stderr=_decode(run_proc.stderr),
         exitCode=run_proc.returncode,
         timeMs=duration_ms,
     )
 
 
-def _run_csharp(payload, stdin_bytes, timeout, tmp_dir, started):
-    source_path = Path(tmp_dir) / "Program.cs"
-    exe_path = Path(tmp_dir) / "Program.exe"
-    source_path.write_text(payload.source)
+async def _run_csharp(payload, stdin_bytes, timeout, tmp_dir, started):
+    source_path = tmp_dir / "Program.cs"
+    exe_path = tmp_dir / "Program.exe"
+    await anyio.Path(source_path).write_text(payload.source)
 
     compile_cmd = ["dotnet", "run", "--project", str(tmp_dir)]
     
     # Create a simple project file for C#
-    project_path = Path(tmp_dir) / "Program.csproj"
+    project_path = tmp_dir / "Program.csproj"
     project_content = """<Project Sdk="Microsoft.NET.Sdk">
   <PropertyGroup>
     <OutputType>Exe</OutputType>
     <TargetFramework>net6.0</TargetFramework>
   </PropertyGroup>
 </Project>"""
-    project_path.write_text(project_content)
+    await anyio.Path(project_path).write_text(project_content)
 
+    # `dotnet run` builds and runs in one process, so it stays uncapped like the
+    # other compile steps; the SDK build alone would exceed a typical cap.
     try:
-        run_proc = _run_process(compile_cmd, stdin_bytes, timeout)
+        run_proc = await _run_process(compile_cmd, stdin_bytes, timeout)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -317,22 +589,22 @@ def _run_csharp(payload, stdin_bytes, timeout, tmp_dir, started):
     except subprocess.TimeoutExpired as exc:
         return _timeout_response(exc, timeout)
 
-    duration_ms = int((time.perf_counter() - started) * 1000)
+    duration_ms = (time.perf_counter_ns() - started) // 1_000_000
     return ExecuteResponse(
-        stdout=run_proc.stdout.decode("utf-8", errors="replace"),
-        stderr=run_proc.stderr.decode("utf-8", errors="replace"),
+        stdout=_decode(run_proc.stdout),
+        stderr=_decode(run_proc.stderr),
         exitCode=run_proc.returncode,
         timeMs=duration_ms,
     )
 
 
-def _run_kotlin(payload, stdin_bytes, timeout, tmp_dir, started):
-    source_path = Path(tmp_dir) / "Main.kt"
-    source_path.write_text(payload.source)
+async def _run_kotlin(payload, stdin_bytes, timeout, tmp_dir, started):
+    source_path = tmp_dir / "Main.kt"
+    await anyio.Path(source_path).write_text(payload.source)
 
-    compile_cmd = ["kotlinc", str(source_path), "-include-runtime", "-d", str(Path(tmp_dir) / "Main.jar")]
+    compile_cmd = ["kotlinc", str(source_path), "-include-runtime", "-d", str(tmp_dir / "Main.jar")]
     try:
-        compile_proc = _run_process(compile_cmd, None, timeout)
+        compile_proc = await _run_process(compile_cmd, None, timeout)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -341,14 +613,14 @@ def _run_kotlin(payload, stdin_bytes, timeout, tmp_dir, started):
         )
     if compile_proc.returncode != 0:
         return ExecuteResponse(
-            stdout=compile_proc.stdout.decode("utf-8", errors="replace"),
-            stderr=compile_proc.stderr.decode("utf-8", errors="replace"),
+            stdout=_decode(compile_proc.stdout),
+            stderr=_decode(compile_proc.stderr),
             exitCode=compile_proc.returncode,
         )
 
-    run_cmd = ["java", "-jar", str(Path(tmp_dir) / "Main.jar")]
+    run_cmd = ["java", "-jar", str(tmp_dir / "Main.jar")]
     try:
-        run_proc = _run_process(run_cmd, stdin_bytes, timeout)
+        run_proc = await _run_process(run_cmd, stdin_bytes, timeout, payload.memoryLimitMb)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -358,23 +630,25 @@ def _run_kotlin(payload, stdin_bytes, timeout, tmp_dir, started):
     except subprocess.TimeoutExpired as exc:
         return _timeout_response(exc, timeout)
 
-    duration_ms = int((time.perf_counter() - started) * 1000)
+    duration_ms = (time.perf_counter_ns() - started) // 1_000_000
     return ExecuteResponse(
-        stdout=run_proc.stdout.decode("utf-8", errors="replace"),
-        stderr=run_proc.stderr.decode("utf-8", errors="replace"),
+        stdout=_decode(run_proc.stdout),
+        stderr=_decode(run_proc.stderr),
         exitCode=run_proc.returncode,
         timeMs=duration_ms,
     )
 
 
-def _run_go(payload, stdin_bytes, timeout, tmp_dir, started):
-    source_path = Path(tmp_dir) / "main.go"
-    source_path.write_text(payload.source)
+async def _run_go(payload, stdin_bytes, timeout, tmp_dir, started):
+    source_path = tmp_dir / "main.go"
+    await anyio.Path(source_path).write_text(payload.source)
 
     # Go can run directly without compilation
     run_cmd = ["go", "run", str(source_path)]
+    # `go run` compiles in the same invocation, so like the other compile
+    # steps it runs without the memory cap.
     try:
-        run_proc = _run_process(run_cmd, stdin_bytes, timeout)
+        run_proc = await _run_process(run_cmd, stdin_bytes, timeout)
     except FileNotFoundError:
         return ExecuteResponse(
             stdout="",
@@ -384,18 +658,26 @@ def _run_go(payload, stdin_bytes, timeout, tmp_dir, started):
     except subprocess.TimeoutExpired as exc:
         return _timeout_response(exc, timeout)
 
-    duration_ms = int((time.perf_counter() - started) * 1000)
+    duration_ms = (time.perf_counter_ns() - started) // 1_000_000
     return ExecuteResponse(
-        stdout=run_proc.stdout.decode("utf-8", errors="replace"),
-        stderr=run_proc.stderr.decode("utf-8", errors="replace"),
+        stdout=_decode(run_proc.stdout),
+        stderr=_decode(run_proc.stderr),
         exitCode=run_proc.returncode,
         timeMs=duration_ms,
     )
 
 
+def _decode(output: Optional[Union[bytes, bytearray]]) -> str:
+    if not output:
+        return ""
+    if len(output) > MAX_OUTPUT_BYTES:
+        return str(memoryview(output)[:MAX_OUTPUT_BYTES], "utf-8", "replace") + "\n...truncated"
+    return output.decode("utf-8", "replace")
+
+
 def _timeout_response(exc: subprocess.TimeoutExpired, timeout: float) -> ExecuteResponse:
-    stdout = exc.stdout.decode("utf-8", errors="replace") if exc.stdout else ""
-    stderr = exc.stderr.decode("utf-8", errors="replace") if exc.stderr else ""
+    stdout = _decode(exc.stdout)
+    stderr = _decode(exc.stderr)
     if stderr:
         stderr = f"{stderr}\nExecution timed out."
     else:
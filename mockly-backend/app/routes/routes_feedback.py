@@ -1,15 +1,70 @@
-from fastapi import APIRouter, Body, HTTPException
+import asyncio
+import functools
+import hashlib
+import re
+from collections import OrderedDict
+
+import orjson
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from ..models import FeedbackReport
 from ..services.workflow.prompts import build_code_evaluation_prompt
 from ..services.workflow.evaluation import parse_evaluation_scores
-from ..services.workflow.clients import anthropic_client
+from ..services.workflow.clients import anthropic_async_client
 from ..services.workflow.config import ANTHROPIC_MODEL
 from ..services.workflow.questions import load_question_by_difficulty
 
 router = APIRouter(prefix="/api", tags=["feedback"]) 
 
-@router.post("/feedback", response_model=FeedbackReport)
-def feedback(payload: dict = Body(...)) -> FeedbackReport:
+EVAL_RE = re.compile(r'<evaluation>(.*?)</evaluation>', re.DOTALL | re.IGNORECASE)
+SECTION_RES = {
+    name: re.compile(rf'\*\*{name}:\*\*\s*(.*?)(?=\*\*[A-Z]|\Z)', re.DOTALL | re.IGNORECASE)
+    for name in ("Code Cleanliness", "Communication", "Efficiency", "Overall Comments")
+}
+SCORE_RE = re.compile(r'\s*Score:\s*[1-5]\s*', re.IGNORECASE)
+
+# Coalesce concurrent identical submissions onto one Claude call and keep a
+# small LRU of finished evaluations keyed by (code, language, question).
+COMPLETED_CACHE_SIZE = 256
+_INFLIGHT: dict[str, asyncio.Task] = {}
+_COMPLETED: "OrderedDict[str, FeedbackReport]" = OrderedDict()
+
+
+# The body is decoded by hand (see feedback), so describe it for OpenAPI here.
+FEEDBACK_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "required": ["code"],
+                    "properties": {
+                        "code": {"type": "string"},
+                        "language": {"type": "string", "default": "python"},
+                        "question": {"description": "Question context, or just its difficulty"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def extract_section_feedback(text: str, section_name: str) -> str:
+    """Extract feedback for a specific section, excluding the score line."""
+    match = SECTION_RES[section_name].search(text)
+    if match:
+        feedback = match.group(1).strip()
+        # Remove the "Score: X" line
+        feedback = SCORE_RE.sub('', feedback)
+        return feedback.strip()
+    return ""
+
+
+@router.post("/feedback", response_model=FeedbackReport, openapi_extra=FEEDBACK_OPENAPI)
+async def feedback(request: Request) -> FeedbackReport:
     """
     Evaluate code submission using Claude AI.
     
@@ -17,31 +72,94 @@ def feedback(payload: dict = Body(...)) -> FeedbackReport:
     - code: The candidate's code (required)
     - language: Programming language (required)
     - question: Optional question context (title, difficulty, statement, or just difficulty)
+
+    Identical submissions share one Claude call while it is in flight, and
+    recent results are served from a small LRU.
     """
-    code = payload.get("code", "").strip()
-    language = payload.get("language", "python").strip()
+    # Decode the body directly with orjson; the payload is free-form so
+    # FastAPI's Body(...) parsing would only add a stdlib json pass. Invalid
+    # bodies still get FastAPI's 422 validation errors.
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as exc:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body", exc.pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": exc.msg}}]
+        ) from None
+    if not isinstance(payload, dict):
+        raise RequestValidationError(
+            [{"type": "dict_type", "loc": ("body",), "msg": "Input should be a valid dictionary", "input": payload}]
+        )
+
+    code = payload.get("code", "")
+    language = payload.get("language", "python")
+    errors = [
+        {"type": "string_type", "loc": ("body", field), "msg": "Input should be a valid string", "input": value}
+        for field, value in (("code", code), ("language", language))
+        if not isinstance(value, str)
+    ]
+    if errors:
+        raise RequestValidationError(errors)
+    code = code.strip()
+    language = language.strip()
     question = payload.get("question")
     
+    if not code:
+        raise HTTPException(400, "Field 'code' is required")
+
+    key = _evaluation_key(code, language, question)
+    cached = _COMPLETED.get(key)
+    if cached is not None:
+        _COMPLETED.move_to_end(key)
+        return cached
+
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_evaluate(code, language, question))
+        _INFLIGHT[key] = task
+        task.add_done_callback(functools.partial(_finish_evaluation, key))
+    # Shield so one caller going away doesn't cancel the shared evaluation.
+    return await asyncio.shield(task)
+
+
+def _evaluation_key(code: str, language: str, question) -> str:
+    digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16)
+    digest.update(b"\0" + language.encode("utf-8") + b"\0")
+    if question is not None:
+        try:
+            digest.update(orjson.dumps(question, option=orjson.OPT_SORT_KEYS))
+        except TypeError:
+            digest.update(repr(question).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _finish_evaluation(key: str, task: asyncio.Task) -> None:
+    _INFLIGHT.pop(key, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    _COMPLETED[key] = task.result()
+    _COMPLETED.move_to_end(key)
+    while len(_COMPLETED) > COMPLETED_CACHE_SIZE:
+        _COMPLETED.popitem(last=False)
+
+
+async def _evaluate(code: str, language: str, question) -> FeedbackReport:
     # If question only has difficulty, load full question details
     if question and isinstance(question, dict):
         difficulty = question.get("difficulty")
         if difficulty and not question.get("statement") and not question.get("prompt"):
             try:
-                full_question = load_question_by_difficulty(difficulty)
+                full_question = await asyncio.to_thread(load_question_by_difficulty, difficulty)
                 if full_question:
                     question = full_question
             except Exception:
                 pass  # Continue with partial question info
     
-    if not code:
-        raise HTTPException(400, "Field 'code' is required")
-    
     # Build the evaluation prompt with code
     evaluation_prompt = build_code_evaluation_prompt(code, language, question)
     
     try:
         # Call Claude to evaluate the code
-        message = anthropic_client.messages.create(
+        message = await anthropic_async_client.messages.create(
             model=ANTHROPIC_MODEL,
             messages=[{"role": "user", "content": evaluation_prompt}],
             max_tokens=4096,
@@ -60,25 +178,10 @@ def feedback(payload: dict = Body(...)) -> FeedbackReport:
         communication = parsed.get("communication") or 3
         efficiency = parsed.get("efficiency") or 3
         
-        # Format the response for better display
-        import re
-        
         # Extract content between <evaluation> tags if present
-        eval_match = re.search(r'<evaluation>(.*?)</evaluation>', full_text, re.DOTALL | re.IGNORECASE)
+        eval_match = EVAL_RE.search(full_text)
         eval_text = eval_match.group(1).strip() if eval_match else full_text
         
-        # Extract each section's feedback (without the scores)
-        def extract_section_feedback(text: str, section_name: str) -> str:
-            """Extract feedback for a specific section, excluding the score line."""
-            pattern = rf'\*\*{section_name}:\*\*\s*(.*?)(?=\*\*[A-Z]|\Z)'
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                feedback = match.group(1).strip()
-                # Remove the "Score: X" line
-                feedback = re.sub(r'\s*Score:\s*[1-5]\s*', '', feedback, flags=re.IGNORECASE)
-                return feedback.strip()
-            return ""
-        
         # Extract feedback for each category
         cleanliness_feedback = extract_section_feedback(eval_text, "Code Cleanliness")
         communication_feedback = extract_section_feedback(eval_text, "Communication")
@@ -1,12 +1,16 @@
+from collections import deque
+import itertools
 import json
+import os
 from pathlib import Path
 import random
-import uuid
+import threading
+from typing import Optional
 
-import yaml
 from fastapi import APIRouter, HTTPException
 
 from ..models import QuestionRequest, QuestionPayload
+from ..services.workflow.questions import load_questions_data
 
 router = APIRouter(prefix="/api", tags=["questions"])
 
@@ -29,84 +33,137 @@ def _load_index_by_difficulty() -> dict[str, list[dict]]:
             examples: [...]
             hints: [...]
     """
-    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = load_questions_data(QUESTIONS_FILE)
 
-    index: dict[str, list[dict]] = {}
+    index: dict[str, tuple[dict, ...]] = {}
     for entry in data.get("difficulties", []):
         diff = str(entry.get("difficulty", "")).strip().lower()
         problems = entry.get("problems") or []
         if diff:
-            index[diff] = problems
+            prepared = [_prepare_problem(problem) for problem in problems]
+            # Shuffled once here; requests then walk the bucket round-robin.
+            random.shuffle(prepared)
+            index[diff] = tuple(prepared)
     return index
 
 
-# Load once; in prod you could add a reload flag or watchdog if the YAML changes.
-_INDEX_BY_DIFF = _load_index_by_difficulty()
+def _prepare_problem(problem: dict) -> dict:
+    """Render the prompt and per-language starter code once at load time."""
+    prompt = (problem.get("statement", "") or "").strip()
+    examples_blob = _format_examples(problem)
+    if examples_blob:
+        prompt = f"{prompt}\n\n{examples_blob}"
+    problem["_rendered_prompt"] = prompt
+    problem["_starters"] = {
+        language: _get_starter_code_for_language(problem, language) or None
+        for language in STARTER_CODE_LANGUAGES
+    }
+    return problem
 
 
 def _format_examples(problem: dict) -> str:
     examples = problem.get("examples") or []
     if not examples:
         return ""
+    return "Examples:\n" + "\n".join(
+        _format_example(idx, example) for idx, example in enumerate(examples, start=1)
+    )
+
+
+def _format_example(idx: int, example: dict) -> str:
+    text = f"- {example.get('name') or f'Example {idx}'}:"
+    if example.get("input") is not None:
+        text += f"\n    Input: {_to_json(example['input'])}"
+    if example.get("output") is not None:
+        text += f"\n    Output: {_to_json(example['output'])}"
+    if example.get("explanation"):
+        text += f"\n    Explanation: {example['explanation']}"
+    return text
+
+
+def _to_json(value) -> str:
+    # Plain ints are the common case and serialize the same via str().
+    return str(value) if type(value) is int else json.dumps(value)
+
 
-    lines: list[str] = ["Examples:"]
-    for idx, example in enumerate(examples, start=1):
-        name = example.get("name") or f"Example {idx}"
-        lines.append(f"- {name}:")
-        if example.get("input") is not None:
-            lines.append(f"    Input: {json.dumps(example['input'])}")
-        if example.get("output") is not None:
-            lines.append(f"    Output: {json.dumps(example['output'])}")
-        if example.get("explanation"):
-            lines.append(f"    Explanation: {example['explanation']}")
-    return "\n".join(lines)
+# Language -> questions.yaml field holding its starter code; anything else uses
+# the default (Python) ``starter_code`` field.
+STARTER_CODE_FIELDS = {
+    "python": "starter_code",
+    "javascript": "starter_code_javascript",
+    "java": "starter_code_java",
+    "cpp": "starter_code_cpp",
+    "typescript": "starter_code_typescript",
+    "go": "starter_code_go",
+    "c": "starter_code_c",
+    "csharp": "starter_code_csharp",
+    "kotlin": "starter_code_kotlin",
+    "ruby": "starter_code_ruby",
+    "perl": "starter_code_perl",
+}
+
+STARTER_CODE_LANGUAGES = tuple(STARTER_CODE_FIELDS)
 
 
 def _get_starter_code_for_language(problem: dict, language: str) -> str:
     """Get starter code for the specified language, falling back to default if not available."""
-    language_map = {
-        "javascript": "starter_code_javascript",
-        "java": "starter_code_java", 
-        "cpp": "starter_code_cpp",
-        "typescript": "starter_code_typescript",
-        "go": "starter_code_go",
-        "c": "starter_code_c",
-        "csharp": "starter_code_csharp",
-        "kotlin": "starter_code_kotlin",
-        "ruby": "starter_code_ruby",
-        "perl": "starter_code_perl",
-    }
-    
-    # Get the appropriate starter code field for the language
-    starter_code_field = language_map.get(language, "starter_code")  # default to python
-    return (problem.get(starter_code_field) or "").rstrip()
+    return (problem.get(STARTER_CODE_FIELDS.get(language, "starter_code")) or "").rstrip()
+
+
+# Loaded once, on first use, so workers that never serve /api/questions don't
+# parse the YAML at startup; in prod you could add a reload flag or watchdog if
+# the YAML changes.
+_INDEX_BY_DIFF: Optional[dict[str, tuple[dict, ...]]] = None
+_CURSORS: dict[str, "itertools.count[int]"] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _index() -> dict[str, tuple[dict, ...]]:
+    global _INDEX_BY_DIFF
+    index = _INDEX_BY_DIFF
+    if index is None:
+        with _INDEX_LOCK:
+            if _INDEX_BY_DIFF is None:
+                index = _load_index_by_difficulty()
+                _CURSORS.update((diff, itertools.count()) for diff in index)
+                _INDEX_BY_DIFF = index
+            index = _INDEX_BY_DIFF
+    return index
+
+
+# Display IDs are cut from one urandom read instead of one syscall per request.
+_ID_POOL: deque[str] = deque()
+
+
+def _next_id() -> str:
+    while True:
+        try:
+            return _ID_POOL.popleft()
+        except IndexError:
+            raw = os.urandom(1024)
+            _ID_POOL.extend(raw[i : i + 4].hex() for i in range(0, len(raw), 4))
 
 
 @router.post("/questions", response_model=QuestionPayload)
 def fetch_question(req: QuestionRequest) -> QuestionPayload:
     # difficulty is case-insensitive in the YAML index
-    bucket = _INDEX_BY_DIFF.get(req.difficulty.lower())
+    difficulty = req.difficulty.lower()
+    bucket = _index().get(difficulty)
     if not bucket:
         raise HTTPException(status_code=404, detail=f"No questions for {req.difficulty}")
 
-    item = random.choice(bucket)
+    item = bucket[next(_CURSORS[difficulty]) % len(bucket)]
 
-    # Map YAML fields -> frontend payload
-    # YAML uses 'statement' as the main problem description. Attach rendered examples.
-    prompt = (item.get("statement", "") or "").strip()
-    examples_blob = _format_examples(item)
-    if examples_blob:
-        prompt = f"{prompt}\n\n{examples_blob}"
+    # Prompt (statement + rendered examples) and starter code were prepared
+    # when questions.yaml was loaded.
+    starters = item["_starters"]
+    starter_code = starters.get(req.language, starters["python"])
 
-    # Get starter code for the requested language
-    starter_code = _get_starter_code_for_language(item, req.language)
-    
     return QuestionPayload(
-        id=f"{req.difficulty}-{uuid.uuid4().hex[:8]}",
+        id=f"{req.difficulty}-{_next_id()}",
         difficulty=req.difficulty,
-        prompt=prompt,
-        starter_code=starter_code or None,
+        prompt=item["_rendered_prompt"],
+        starter_code=starter_code,
         language=req.language,
         answers=None,
     )
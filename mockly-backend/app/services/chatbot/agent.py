@@ -7,50 +7,98 @@ FastAPI endpoints can be switched to call into this module.
 """
 from typing import Iterable, AsyncIterator
 import asyncio
+import re
+import time
+
+from app.services.workflow.claude import iterate_in_thread
 
 from .claude_client import ClaudeClient
 from .prompts import build_system_prompt_from_question
 from .tts_adapter import DeepgramTTSAdapter
 
 
-def sentence_chunks(token_iter: Iterable[str], min_chars: int = 24, first_flush_ms: int = 900) -> Iterable[str]:
+# Terminal punctuation followed by whitespace, matched against the last two
+# buffered characters.
+_SENTENCE_END = re.compile(r"[.!?]\s")
+
+
+def sentence_chunks(
+    token_iter: Iterable[str],
+    min_chars: int = 24,
+    first_flush_ms: int = 900,
+    coalesce_after_first: int = 1,
+    max_chars: int = 400,
+    max_wait_ms: int = 650,
+) -> Iterable[str]:
     """Chunk a token iterator into sentence-like pieces.
 
     Logic mirrors the version used in `workflow/api.py` so auditory
-    flushing behavior is preserved when moving endpoints over.
+    flushing behavior is preserved when moving endpoints over. After the
+    first chunk (kept small for a fast first audio frame), up to
+    `coalesce_after_first` pieces or `max_chars` characters can be merged
+    per yield so the TTS socket gets fewer, larger Speak messages; a batch
+    is never held longer than `max_wait_ms`. The default of 1 disables
+    coalescing.
     """
-    import re, time
-
-    buf, acc = [], 0
+    # A single-owner str grows in place with +=, so no per-token join.
+    buf = ""
+    batch, batch_pieces = "", 0
     first_started_at = None
+    first_flush_ns = first_flush_ms * 1_000_000
+    batch_started_at = 0
+    max_wait_ns = max_wait_ms * 1_000_000
     first_chunk_sent = False
 
     for tok in token_iter:
         if first_started_at is None:
-            first_started_at = time.perf_counter()
-        buf.append(tok)
-        acc += len(tok)
-        joined = "".join(buf)
+            first_started_at = time.perf_counter_ns()
+        buf += tok
+
+        # Any newline flushes right away, so only the new token can hold one.
+        if _SENTENCE_END.fullmatch(buf[-2:]) or "\n" in tok or len(buf) >= min_chars:
+            if not first_chunk_sent:
+                out = buf.strip()
+                if out:
+                    yield out
+                    first_chunk_sent = True
+            else:
+                # Keep the raw text so spacing between merged pieces survives.
+                now = time.perf_counter_ns()
+                if not batch:
+                    batch_started_at = now
+                batch += buf
+                if buf.strip():
+                    batch_pieces += 1
+                if (
+                    batch_pieces >= coalesce_after_first
+                    or len(batch) >= max_chars
+                    or now - batch_started_at >= max_wait_ns
+                ):
+                    out = batch.strip()
+                    if out:
+                        yield out
+                    batch, batch_pieces = "", 0
+            buf, first_started_at = "", None
+            continue
 
-        if re.search(r"[.!?]\s$", joined) or "\n" in joined or acc >= min_chars:
-            out = joined.strip()
+        # Don't let a slow stream hold finished sentences back from TTS.
+        if batch and time.perf_counter_ns() - batch_started_at >= max_wait_ns:
+            out = batch.strip()
             if out:
                 yield out
-                first_chunk_sent = True
-            buf, acc, first_started_at = [], 0, None
-            continue
+            batch, batch_pieces = "", 0
 
         if not first_chunk_sent and first_started_at is not None:
-            elapsed_ms = (time.perf_counter() - first_started_at) * 1000.0
-            if elapsed_ms >= first_flush_ms and joined.strip():
-                yield joined.strip()
-                buf, acc, first_started_at = [], 0, None
-                first_chunk_sent = True
+            if time.perf_counter_ns() - first_started_at >= first_flush_ns:
+                out = buf.strip()
+                if out:
+                    yield out
+                    buf, first_started_at = "", None
+                    first_chunk_sent = True
 
-    if buf:
-        out = "".join(buf).strip()
-        if out:
-            yield out
+    out = (batch + buf).strip()
+    if out:
+        yield out
 
 
 class ChatbotAgent:
@@ -83,7 +131,8 @@ class ChatbotAgent:
         """
         system = build_system_prompt_from_question(question)
         tokens = self.claude.stream_text(user_text, system=system)
-        chunks = sentence_chunks(tokens)
+        # Claude streaming and chunking block, so they run on a worker thread.
+        chunks = iterate_in_thread(sentence_chunks(tokens))
         async for audio in self.tts.stream(chunks):
             yield audio
 
@@ -1,138 +1,64 @@
 """Prompt helpers and question loader.
 
-This module contains `build_system_prompt_from_question` and a small
-helper to load a question by difficulty from a `questions.yaml` file
-if present. The implementation mirrors the behavior in
-`workflow/api.py` but is colocated here for the chatbot package.
+This module contains `build_system_prompt_from_question` and re-exports
+`load_question_by_difficulty` from `workflow/questions.py`. The prompt
+mirrors the behavior in `workflow/api.py` but is colocated here for the
+chatbot package.
 """
-from pathlib import Path
-from typing import Any
+import functools
 import re
 
-try:
-    import yaml as _yaml  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    _yaml = None
+from app.services.workflow.questions import load_question_by_difficulty
+
+# The formatting and cache-key helpers are shared with the workflow prompt
+# builder; only the prompt text itself differs.
+from app.services.workflow.prompts import PROMPT_FIELDS, TEXT_FIELDS, format_example, freeze_value, thaw_value
 
 
 def _format_examples(examples) -> str:
     try:
         if not examples:
             return ""
-        lines = []
-        for ex in examples:
-            if isinstance(ex, dict):
-                name = ex.get("name") or ex.get("title") or "example"
-                inp = ex.get("input")
-                out = ex.get("output")
-                expl = ex.get("explanation")
-                seg = f"- {name}:\n  input: {inp}\n  output: {out}"
-                if expl:
-                    seg += f"\n  note: {expl}"
-                lines.append(seg)
-            else:
-                lines.append(f"- {ex}")
-        return "\n".join(lines)
+        return "\n".join(map(format_example, examples))
     except Exception:
         return ""
 
 
-def _find_questions_yaml() -> Path | None:
-    # We expect this file under the project root (mockly-backend)
-    base = Path(__file__).resolve().parents[3]  # mockly-backend
-    for cand in [base / "app" / "questions.yaml", base / "questions.yaml"]:
-        if cand.exists():
-            return cand
-    return None
-
-
-def load_question_by_difficulty(difficulty: str) -> dict | None:
-    if not difficulty:
-        return None
-    if _yaml is None:
-        raise RuntimeError("PyYAML not installed; cannot load questions.yaml. Add PyYAML to requirements and install.")
-    path = _find_questions_yaml()
-    if not path:
-        raise FileNotFoundError("questions.yaml not found under app/ or project root.")
-    data = _yaml.safe_load(path.read_text(encoding="utf-8")) or {}
-    diffs = data.get("difficulties") or []
-    target = str(difficulty).strip().lower()
-    for entry in diffs:
-        if str(entry.get("difficulty", "")).strip().lower() == target:
-            problems = entry.get("problems") or []
-            if problems:
-                q = dict(problems[0])
-                q.setdefault("difficulty", difficulty)
-                return q
-            break
-    return None
-
-
 def build_system_prompt_from_question(question: dict | None) -> str:
     """Construct the interviewer system prompt from a question dict.
 
     The prompt format intentionally mirrors the long template in
     `workflow/api.py` so existing endpoints can reuse it.
     """
-    if not isinstance(question, dict):
-        question = {}
+    if not isinstance(question, dict) or not question:
+        return _EMPTY_QUESTION_PROMPT
+    # Interview turns rebuild the prompt for the same question over and over.
+    try:
+        return _build_prompt_cached(tuple((field, freeze_value(question.get(field))) for field in PROMPT_FIELDS))
+    except TypeError:  # unhashable values (e.g. sets) in the question data
+        return _render_system_prompt(question)
 
-    title = (question.get("title") or "").strip()
-    difficulty = (question.get("difficulty") or "").strip()
-    statement = (question.get("statement") or question.get("prompt") or "").strip()
-    input_fmt = (question.get("input_format") or "").strip()
-    output_fmt = (question.get("output_format") or "").strip()
-    examples = _format_examples(question.get("examples"))
-    hints = question.get("hints") or []
-    hints_list: list[str] = []
-    if isinstance(hints, list):
-        hints_list = [str(h).strip() for h in hints if str(h).strip()]
-    else:
-        if str(hints).strip():
-            hints_list = [str(hints).strip()]
 
-    limited_hints = hints_list[:2]
-    limited_hints_text = "\n".join(f"- {h}" for h in limited_hints)
+@functools.lru_cache(maxsize=256)
+def _build_prompt_cached(key: tuple) -> str:
+    return _render_system_prompt({field: thaw_value(frozen) for field, frozen in key})
 
-    qd_lines: list[str] = []
-    if title or difficulty:
-        head = []
-        if title:
-            head.append(f"Title: {title}")
-        if difficulty:
-            head.append(f"Difficulty: {difficulty}")
-        qd_lines.append(" ".join(head))
-        qd_lines.append("")
-    if statement:
-        qd_lines.append("Problem Statement:")
-        qd_lines.append(statement)
-        qd_lines.append("")
-    if input_fmt:
-        qd_lines.append("Input Format:")
-        qd_lines.append(input_fmt)
-        qd_lines.append("")
-    if output_fmt:
-        qd_lines.append("Output Format:")
-        qd_lines.append(output_fmt)
-        qd_lines.append("")
-    if examples:
-        qd_lines.append("Examples:")
-        qd_lines.append(examples)
-        qd_lines.append("")
-    if limited_hints_text:
-        qd_lines.append("Hints (use at most two; ordered):")
-        qd_lines.append(limited_hints_text)
-        qd_lines.append("")
-
-    question_details = "\n".join([ln for ln in qd_lines if ln is not None])
 
-    parts = [
+# Static instructions around the per-question details; the trailing/leading
+# "" supply the newlines that join the three pieces.
+_PROMPT_HEADER = "\n".join(
+    [
         "You will be acting as a technical interviewer conducting a coding interview with a candidate. "
         "You will present them with a LeetCode-style algorithmic problem and evaluate their performance.",
         "",
         "Here are the question details you should use:",
         "<question_details>",
-        question_details,
+        "",
+    ]
+)
+_PROMPT_FOOTER = "\n".join(
+    [
+        "",
         "</question_details>",
         "",
         "When I write BEGIN INTERVIEW, you will start the technical interview. "
@@ -209,8 +135,64 @@ def build_system_prompt_from_question(question: dict | None) -> str:
         "",
         "BEGIN INTERVIEW",
     ]
+)
+
+# With no question there are no details to render.
+_EMPTY_QUESTION_PROMPT = _PROMPT_HEADER + _PROMPT_FOOTER
+
+
+def _render_system_prompt(question: dict) -> str:
+    title, difficulty, input_fmt, output_fmt = [(question.get(field) or "").strip() for field in TEXT_FIELDS]
+    statement = (question.get("statement") or question.get("prompt") or "").strip()
+    examples = _format_examples(question.get("examples"))
+    hints = question.get("hints") or []
+    if isinstance(hints, list):
+        hints_list = [hint for hint in (str(h).strip() for h in hints) if hint]
+    else:
+        hint = str(hints).strip()
+        hints_list = [hint] if hint else []
+
+    # At most two hints are offered, so format them directly.
+    if len(hints_list) >= 2:
+        limited_hints_text = f"- {hints_list[0]}\n- {hints_list[1]}"
+    elif hints_list:
+        limited_hints_text = f"- {hints_list[0]}"
+    else:
+        limited_hints_text = ""
+
+    qd_lines: list[str] = []
+    if title or difficulty:
+        head = []
+        if title:
+            head.append(f"Title: {title}")
+        if difficulty:
+            head.append(f"Difficulty: {difficulty}")
+        qd_lines.append(" ".join(head))
+        qd_lines.append("")
+    if statement:
+        qd_lines.append("Problem Statement:")
+        qd_lines.append(statement)
+        qd_lines.append("")
+    if input_fmt:
+        qd_lines.append("Input Format:")
+        qd_lines.append(input_fmt)
+        qd_lines.append("")
+    if output_fmt:
+        qd_lines.append("Output Format:")
+        qd_lines.append(output_fmt)
+        qd_lines.append("")
+    if examples:
+        qd_lines.append("Examples:")
+        qd_lines.append(examples)
+        qd_lines.append("")
+    if limited_hints_text:
+        qd_lines.append("Hints (use at most two; ordered):")
+        qd_lines.append(limited_hints_text)
+        qd_lines.append("")
+
+    question_details = "\n".join(qd_lines)
 
-    return "\n".join(part for part in parts if part is not None)
+    return _PROMPT_HEADER + question_details + _PROMPT_FOOTER
 
 
 __all__ = [
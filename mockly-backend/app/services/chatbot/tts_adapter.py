@@ -12,6 +12,7 @@ import asyncio
 import logging
 from deepgram import DeepgramClient
 from deepgram.core.events import EventType
+from app.services.workflow.tts import TTS_FRAME_QUEUE_SIZE, FramePump, frames_until_closed
 from app.services.workflow.config import (
     DEEPGRAM_API_KEY,
     DEEPGRAM_TTS_VOICE,
@@ -22,22 +23,30 @@ from app.services.workflow.config import (
 logger = logging.getLogger(__name__)
 
 
+# Compiled once; sanitize_for_tts runs for every streamed sentence. Headings and
+# tags share one scan: neither removal can create a match for the other.
+_MARKUP_RE = re.compile(r"(?m:^\s{0,3}#{1,6}\s*)|</?[^>\n]+>")
+_STARS_RE = re.compile(r"\*{2,}")
+_SPACES_RE = re.compile(r"[ \t]+")
+# Characters any of the substitutions below could change.
+_NEEDS_SANITIZE_RE = re.compile(r"[`*_#<\t]|  ")
+
+
 def sanitize_for_tts(text: str) -> str:
     if not text:
         return ""
-    # Remove code fences/backticks
-    text = re.sub(r"```+", "", text)
+    if not _NEEDS_SANITIZE_RE.search(text):
+        return text.strip()
+    # Remove code fences/backticks (dropping every backtick covers both)
     text = text.replace("`", "")
     # Remove bold/italics markers
     text = text.replace("**", "").replace("__", "")
-    # Strip markdown headings at line starts
-    text = re.sub(r"^\s{0,3}#{1,6}\s*", "", text, flags=re.M)
-    # Remove xml/html-like tags
-    text = re.sub(r"</?[^>\n]+>", "", text)
-    # Collapse repeated asterisks
-    text = re.sub(r"\*{2,}", "", text)
+    # Strip markdown headings at line starts and xml/html-like tags
+    text = _MARKUP_RE.sub("", text)
+    # Collapse repeated asterisks (tag removal can join single ones)
+    text = _STARS_RE.sub("", text)
     # Normalize excess spaces (keep newlines)
-    text = re.sub(r"[ \t]+", " ", text)
+    text = _SPACES_RE.sub(" ", text)
     return text.strip()
 
 
@@ -60,21 +69,25 @@ class DeepgramTTSAdapter:
         This implements the same high-level flow as the existing
         `stream_deepgram_tts` helper in `workflow/api.py`.
         """
-        q: asyncio.Queue[bytes] = asyncio.Queue()
-        closed = {"flag": False}
-        saw_audio = {"flag": False}
+        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=TTS_FRAME_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        closed = asyncio.Event()
+        saw_audio = False
+
+        pump = FramePump(loop, q)
 
         def on_message(msg):
-            # audio bytes may arrive as raw bytes
+            nonlocal saw_audio
+            # audio bytes may arrive as raw bytes, on the listener thread
             if isinstance(msg, (bytes, bytearray)):
-                saw_audio["flag"] = True
-                q.put_nowait(bytes(msg));
+                saw_audio = True
+                pump.push(msg)
                 return
             mtype = getattr(msg, "type", None) or getattr(msg, "_type", None)
             data = getattr(msg, "data", None)
             if str(mtype).lower() == "audio" and isinstance(data, (bytes, bytearray)):
-                saw_audio["flag"] = True
-                q.put_nowait(bytes(data));
+                saw_audio = True
+                pump.push(data)
                 return
             logger.info(f"[Deepgram WS] non-audio: {msg!r}")
 
@@ -85,7 +98,7 @@ class DeepgramTTSAdapter:
         ) as ws:
             ws.on(EventType.OPEN, lambda _: logger.info("[Deepgram WS] OPEN"))
             ws.on(EventType.MESSAGE, on_message)
-            ws.on(EventType.CLOSE, lambda _: (closed.update({"flag": True}), logger.info("[Deepgram WS] CLOSE")))
+            ws.on(EventType.CLOSE, lambda _: (loop.call_soon_threadsafe(closed.set), logger.info("[Deepgram WS] CLOSE")))
             ws.on(EventType.ERROR, lambda e: logger.error(f"[Deepgram WS] ERROR: {e}"))
             ws.start_listening()
 
@@ -93,50 +106,47 @@ class DeepgramTTSAdapter:
                 try:
                     FLUSH_CHARS = 220
                     FLUSH_MS = 650
-                    last_flush = asyncio.get_event_loop().time()
+                    last_flush = loop.time()
+                    # Sentences are queued and sent as one Speak per flush.
+                    pending: list[str] = []
                     pending_chars = 0
+
+                    def flush() -> None:
+                        ws.send_text({"type": "Speak", "text": " ".join(pending)})
+                        ws.send_text({"type": "Flush"})
+                        pending.clear()
+
+                    def queue(sentence) -> None:
+                        nonlocal pending_chars, last_flush
+                        clean = sanitize_for_tts(str(sentence)).strip()
+                        if not clean:
+                            return
+                        pending.append(clean)
+                        pending_chars += len(clean)
+                        now = loop.time()
+                        if pending_chars >= FLUSH_CHARS or (now - last_flush) * 1000.0 >= FLUSH_MS:
+                            flush()
+                            pending_chars = 0
+                            last_flush = now
+
                     if hasattr(sentences, "__aiter__"):
                         async for sentence in sentences:  # type: ignore[attr-defined]
-                            clean = sanitize_for_tts(str(sentence)).strip()
-                            if not clean:
-                                continue
-                            ws.send_text({"type": "Speak", "text": clean})
-                            pending_chars += len(clean)
-                            now = asyncio.get_event_loop().time()
-                            if pending_chars >= FLUSH_CHARS or (now - last_flush) * 1000.0 >= FLUSH_MS:
-                                ws.send_text({"type": "Flush"})
-                                pending_chars = 0
-                                last_flush = now
+                            queue(sentence)
                             await asyncio.sleep(0)
                     else:
                         for sentence in sentences:  # type: ignore
-                            clean = sanitize_for_tts(str(sentence)).strip()
-                            if not clean:
-                                continue
-                            ws.send_text({"type": "Speak", "text": clean})
-                            pending_chars += len(clean)
-                            now = asyncio.get_event_loop().time()
-                            if pending_chars >= FLUSH_CHARS or (now - last_flush) * 1000.0 >= FLUSH_MS:
-                                ws.send_text({"type": "Flush"})
-                                pending_chars = 0
-                                last_flush = now
+                            queue(sentence)
                             await asyncio.sleep(0)
+                    if pending:
+                        flush()
                 except Exception:
                     pass
 
             send_task = asyncio.create_task(_send_chunks())
 
-            last = asyncio.get_event_loop().time(); total = 0
             try:
-                while True:
-                    try:
-                        frame = await asyncio.wait_for(q.get(), timeout=0.8)
-                        total += len(frame)
-                        yield frame
-                        last = asyncio.get_event_loop().time()
-                    except asyncio.TimeoutError:
-                        if closed["flag"] and (asyncio.get_event_loop().time() - last) > 0.8:
-                            break
+                async for frame in frames_until_closed(q, closed):
+                    yield frame
 
                 if not send_task.done():
                     send_task.cancel()
@@ -148,8 +158,10 @@ class DeepgramTTSAdapter:
                 with contextlib.suppress(Exception):
                     ws.send_text({"type": "Close"})
 
-        if not saw_audio["flag"]:
+        if not saw_audio:
             logger.warning("[Deepgram WS] no audio frames were received")
+        if pump.dropped_frames:
+            logger.warning("[Deepgram WS] dropped %d queued audio frames (slow consumer)", pump.dropped_frames)
 
 
 __all__ = ["sanitize_for_tts", "DeepgramTTSAdapter"]
@@ -1,17 +1,35 @@
+import array
 import asyncio
 import contextlib
+import copy
+import functools
 import logging
+import os
 import time
 import uuid
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Deque, Dict, List, Optional
+from typing import Dict, List, Optional
 
 from aiortc.sdp import candidate_from_sdp
 from aiortc import RTCPeerConnection, RTCSessionDescription, RTCIceCandidate
 
 logger = logging.getLogger(__name__)
 
+# Clients often reload without DELETE-ing their session, so idle sessions are
+# reaped and the total is capped (oldest first) whenever a new one is created.
+SESSION_IDLE_TTL_SECONDS = float(os.getenv("WEBRTC_SESSION_TTL_SECONDS", "1800"))
+MAX_SESSIONS = int(os.getenv("WEBRTC_MAX_SESSIONS", "1000"))
+# Number of recent audio frame timestamps kept per session for get_stats.
+AUDIO_EVENTS_WINDOW = 50
+# Record a timestamp every Nth audio frame (~20 ms each) rather than every frame.
+AUDIO_SAMPLE_EVERY = 8
+
+
+@functools.lru_cache(maxsize=512)
+def _candidate_from_sdp(cand: str) -> RTCIceCandidate:
+    # Cached parse; callers must copy before setting sdpMid/sdpMLineIndex.
+    return candidate_from_sdp(cand)
+
 
 @dataclass
 class WebRtcSessionState:
@@ -19,7 +37,11 @@ class WebRtcSessionState:
     tasks: List[asyncio.Task] = field(default_factory=list)
     last_audio_timestamp: Optional[float] = None
     frames_received: int = 0
-    audio_events: Deque[float] = field(default_factory=lambda: deque(maxlen=50))
+    # Ring buffer of recent frame timestamps; audio_events_idx is the next slot.
+    audio_events: array.array = field(default_factory=lambda: array.array("d", bytes(8 * AUDIO_EVENTS_WINDOW)))
+    audio_events_idx: int = 0
+    audio_events_count: int = 0
+    last_activity: float = field(default_factory=time.monotonic)
 
 
 class WebRtcManager:
@@ -27,6 +49,7 @@ class WebRtcManager:
         self._sessions: Dict[str, WebRtcSessionState] = {}
 
     async def create_session(self, sdp: str, sdp_type: str) -> tuple[str, RTCPeerConnection]:
+        await self._reap_sessions()
         session_id = uuid.uuid4().hex
         pc = RTCPeerConnection()
         state = WebRtcSessionState(pc=pc)
@@ -41,6 +64,11 @@ class WebRtcManager:
             task = asyncio.create_task(self._consume_audio(session_id, track))
             state.tasks.append(task)
 
+        @pc.on("connectionstatechange")
+        async def on_connectionstatechange() -> None:
+            if pc.connectionState in ("failed", "closed"):
+                await self.close_session(session_id)
+
         await pc.setRemoteDescription(RTCSessionDescription(sdp=sdp, type=sdp_type))
         answer = await pc.createAnswer()
         await pc.setLocalDescription(answer)
@@ -50,6 +78,7 @@ class WebRtcManager:
         state = self._sessions.get(session_id)
         if not state:
             raise KeyError(session_id)
+        state.last_activity = time.monotonic()
 
         if not candidate_payload:
             await state.pc.addIceCandidate(None)
@@ -70,6 +99,18 @@ class WebRtcManager:
 
         await state.pc.close()
 
+    async def _reap_sessions(self) -> None:
+        cutoff = time.monotonic() - SESSION_IDLE_TTL_SECONDS
+        expired = [sid for sid, state in self._sessions.items() if state.last_activity < cutoff]
+        # Dicts keep insertion order, so the first remaining keys are the oldest.
+        overflow = len(self._sessions) - len(expired) - (MAX_SESSIONS - 1)
+        if overflow > 0:
+            expired_ids = set(expired)
+            expired += [sid for sid in self._sessions if sid not in expired_ids][:overflow]
+        for session_id in expired:
+            logger.info("Session %s: closing idle/overflow session", session_id)
+            await self.close_session(session_id)
+
     def get_stats(self, session_id: str) -> Optional[dict]:
         state = self._sessions.get(session_id)
         if not state:
@@ -81,25 +122,44 @@ class WebRtcManager:
             "signalingState": state.pc.signalingState,
             "framesReceived": state.frames_received,
             "lastAudioTimestamp": state.last_audio_timestamp,
-            "recentAudioTimestamps": list(state.audio_events),
+            "recentAudioTimestamps": self._recent_audio_events(state),
         }
 
+    @staticmethod
+    def _recent_audio_events(state: WebRtcSessionState) -> List[float]:
+        """Return the buffered frame timestamps, oldest first."""
+        events, idx = state.audio_events, state.audio_events_idx
+        if state.audio_events_count < AUDIO_EVENTS_WINDOW:
+            return events[:idx].tolist()
+        return events[idx:].tolist() + events[:idx].tolist()
+
     async def _consume_audio(self, session_id: str, track) -> None:
         state = self._sessions.get(session_id)
         if not state:
             return
 
+        frames = state.frames_received
         try:
             while True:
                 _ = await track.recv()
-                state.frames_received += 1
-                state.last_audio_timestamp = time.time()
-                state.audio_events.append(state.last_audio_timestamp)
-                if state.frames_received % 60 == 0:
+                frames += 1
+                state.frames_received = frames
+                # Timestamps are only sampled every AUDIO_SAMPLE_EVERY frames
+                # (starting with the first) to keep the per-frame path cheap.
+                if frames % AUDIO_SAMPLE_EVERY == 1:
+                    now = time.time()
+                    state.last_audio_timestamp = now
+                    idx = state.audio_events_idx
+                    state.audio_events[idx] = now
+                    state.audio_events_idx = (idx + 1) % AUDIO_EVENTS_WINDOW
+                    if state.audio_events_count < AUDIO_EVENTS_WINDOW:
+                        state.audio_events_count += 1
+                    state.last_activity = time.monotonic()
+                if frames % 60 == 0:
                     logger.info(
                         "Session %s: received %s audio frames (latest at %s)",
                         session_id,
-                        state.frames_received,
+                        frames,
                         state.last_audio_timestamp,
                     )
         except Exception as exc:  # noqa: BLE001
@@ -118,11 +178,10 @@ class WebRtcManager:
             raise ValueError("ICE candidate payload missing 'candidate' field")
 
         # Some clients send "candidate:" prefix; strip it if present
-        if cand.startswith("candidate:"):
-            cand = cand.split(":", 1)[1]
+        cand = cand.removeprefix("candidate:")
 
         # Build aiortc RTCIceCandidate from the SDP fragment
-        rtc_cand = candidate_from_sdp(cand)
+        rtc_cand = copy.copy(_candidate_from_sdp(cand))
 
         # Populate mid / mline index (aiortc requires one of these)
         rtc_cand.sdpMid = payload.get("sdpMid") or payload.get("id")
@@ -1,11 +1,82 @@
 from __future__ import annotations
 
-import json
+import atexit
 import os
+import queue
 import threading
 import time
 from typing import Any
 
+import orjson
+
+
+# All captures share one daemon writer thread, so disk I/O never runs on the
+# event loop or the Deepgram callback thread. Items are (capture, event, op).
+_WRITE_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+_WRITER_LOCK = threading.Lock()
+_writer: threading.Thread | None = None
+_FLUSH = "flush"
+_CLOSE = "close"
+
+
+def _serialize(obj: dict[str, Any]) -> bytes:
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    except Exception:
+        # Fallback to string repr if non-serializable
+        return orjson.dumps({"event": "error", "detail": str(obj)}, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _drain_writes() -> None:
+    open_captures: set[LiveTTSCapture] = set()
+    while True:
+        batch = [_WRITE_QUEUE.get()]
+        # Drain whatever else is already queued so a burst costs one wakeup.
+        while True:
+            try:
+                batch.append(_WRITE_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        for item in batch:
+            if item is None:
+                for capture in open_captures:
+                    capture._close_file()
+                return
+            capture, obj, op = item
+            try:
+                capture._write_line(_serialize(obj))
+                open_captures.add(capture)
+                if op == _FLUSH:
+                    capture._fh.flush()
+                elif op == _CLOSE:
+                    capture._closed = True
+            except Exception:
+                pass
+        # Closed captures only reopen for late audio events; don't hold them.
+        for capture in [c for c in open_captures if c._closed]:
+            open_captures.discard(capture)
+            try:
+                capture._close_file()
+            except Exception:
+                pass
+
+
+def _enqueue(item) -> None:
+    global _writer
+    if _writer is None:
+        with _WRITER_LOCK:
+            if _writer is None:
+                _writer = threading.Thread(target=_drain_writes, name="tts-capture-writer", daemon=True)
+                _writer.start()
+    _WRITE_QUEUE.put(item)
+
+
+@atexit.register
+def _stop_writer() -> None:
+    if _writer is not None:
+        _WRITE_QUEUE.put(None)
+        _writer.join(timeout=2.0)
+
 
 class LiveTTSCapture:
     """
@@ -24,10 +95,13 @@ class LiveTTSCapture:
         self.sample_rate = sample_rate
         self.encoding = encoding
         self.voice = voice
-        self._lock = threading.Lock()
         self._t0 = time.perf_counter()
         self._elapsed_ms = 0.0
         self._index = 0
+        # Only touched by the writer thread. Closed once close() is processed;
+        # the audio loop can still report frames after that, which reopen it.
+        self._fh = None
+        self._closed = False
         # Ensure directory exists if a nested path was given
         try:
             os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
@@ -44,15 +118,18 @@ class LiveTTSCapture:
     def _now_ms(self) -> float:
         return (time.perf_counter() - self._t0) * 1000.0
 
-    def _write(self, obj: dict[str, Any]) -> None:
-        try:
-            line = json.dumps(obj, ensure_ascii=False)
-        except Exception:
-            # Fallback to string repr if non-serializable
-            line = json.dumps({"event": "error", "detail": str(obj)})
-        with self._lock:
-            with open(self.path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+    def _write(self, obj: dict[str, Any], op: str | None = None) -> None:
+        _enqueue((self, obj, op))
+
+    def _write_line(self, line: bytes) -> None:
+        if self._fh is None:
+            self._fh = open(self.path, "ab", buffering=65536)
+        self._fh.write(line)
+
+    def _close_file(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
 
     def speak(self, text: str) -> None:
         self._write({
@@ -64,7 +141,7 @@ class LiveTTSCapture:
         self._index += 1
 
     def flush(self) -> None:
-        self._write({"event": "flush", "at_ms": round(self._now_ms(), 3)})
+        self._write({"event": "flush", "at_ms": round(self._now_ms(), 3)}, _FLUSH)
 
     def audio(self, bytes_len: int, elapsed_ms: float) -> None:
         self._elapsed_ms = elapsed_ms
@@ -80,7 +157,7 @@ class LiveTTSCapture:
             "event": "close",
             "at_ms": round(self._now_ms(), 3),
             "elapsed_ms": round(self._elapsed_ms, 3),
-        })
+        }, _CLOSE)
 
 
 __all__ = ["LiveTTSCapture"]
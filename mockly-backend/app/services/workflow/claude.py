@@ -4,12 +4,17 @@ Anthropic streaming helpers.
 
 from __future__ import annotations
 
-from typing import Iterable
+import asyncio
+import contextlib
+import threading
+from typing import AsyncIterator, Iterable, TypeVar
 
 from .clients import anthropic_client
 from .config import ANTHROPIC_MODEL
 from .prompts import build_system_prompt_from_question
 
+T = TypeVar("T")
+
 
 def stream_claude_text(user_text: str, system_override: str | None = None) -> Iterable[str]:
     """
@@ -30,4 +35,60 @@ def stream_claude_text(user_text: str, system_override: str | None = None) -> It
                 yield piece
 
 
-__all__ = ["stream_claude_text"]
+class _Failed:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+async def iterate_in_thread(iterable: Iterable[T]) -> AsyncIterator[T]:
+    """
+    Drive a blocking iterator on a worker thread and yield its items here, so
+    the event loop keeps serving other sessions while it waits on the network.
+    Exceptions from the iterator are re-raised in the consumer.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    stop = threading.Event()
+
+    def put(item) -> None:
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def worker() -> None:
+        it = iter(iterable)
+        try:
+            for item in it:
+                put(item)
+                if stop.is_set():
+                    break
+        except BaseException as exc:  # noqa: BLE001
+            put(_Failed(exc))
+        finally:
+            # Closes e.g. the Anthropic stream context if we stopped early.
+            with contextlib.suppress(Exception):
+                getattr(it, "close", lambda: None)()
+            put(done)
+
+    task = asyncio.ensure_future(asyncio.to_thread(worker))
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, _Failed):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        if task.done():
+            await task
+
+
+async def stream_claude_text_async(user_text: str, system_override: str | None = None) -> AsyncIterator[str]:
+    """Async variant of `stream_claude_text` that reads the SDK stream off the event loop."""
+    async for piece in iterate_in_thread(stream_claude_text(user_text, system_override)):
+        yield piece
+
+
+__all__ = ["stream_claude_text", "stream_claude_text_async", "iterate_in_thread"]
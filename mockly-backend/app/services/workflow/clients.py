@@ -2,12 +2,20 @@
 Shared third-party SDK clients for the workflow service.
 """
 
-from anthropic import Anthropic
+import httpx
+from anthropic import Anthropic, AsyncAnthropic
 from deepgram import DeepgramClient
 
 from .config import ANTHROPIC_API_KEY, DEEPGRAM_API_KEY
 
 anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY)
+anthropic_async_client = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
 deepgram_client = DeepgramClient(api_key=DEEPGRAM_API_KEY)
+# Pooled client for Deepgram's REST endpoints so repeated STT calls reuse
+# warm keep-alive connections instead of a new TCP+TLS handshake each time.
+deepgram_http_client = httpx.AsyncClient(
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
 
-__all__ = ["anthropic_client", "deepgram_client"]
+__all__ = ["anthropic_client", "anthropic_async_client", "deepgram_client", "deepgram_http_client"]
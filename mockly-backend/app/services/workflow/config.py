@@ -7,25 +7,34 @@ dragging in unrelated globals.
 
 from __future__ import annotations
 
+import functools
 import os
 
-try:
-    from dotenv import load_dotenv
 
-    load_dotenv()
-except Exception:
-    pass
+@functools.cache
+def _load_env() -> dict[str, str]:
+    """Parse .env once and snapshot the environment the settings below read."""
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except Exception:
+        pass
+    return dict(os.environ)
+
+
+_ENV = _load_env()
 
 
 def _required(name: str) -> str:
-    value = os.getenv(name)
+    value = _ENV.get(name)
     if not value:
         raise RuntimeError(f"Missing {name}. Create .env from .env.example and set it.")
     return value
 
 
 def _optional(name: str, default: str = "") -> str:
-    return os.getenv(name, default)
+    return _ENV.get(name, default)
 
 
 ANTHROPIC_API_KEY = _required("ANTHROPIC_API_KEY")
@@ -36,11 +45,15 @@ ANTHROPIC_MODEL = _optional("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
 DEEPGRAM_TTS_VOICE = _optional("DEEPGRAM_TTS_VOICE", "aura-2-thalia-en")
 DEEPGRAM_STREAM_ENCODING = _optional("DEEPGRAM_STREAM_ENCODING", "linear16")
 DEEPGRAM_SAMPLE_RATE = int(_optional("DEEPGRAM_SAMPLE_RATE", "48000"))
+# Resolved once here; the TTS audio loops check it per frame.
+DEEPGRAM_STREAM_IS_LINEAR16 = DEEPGRAM_STREAM_ENCODING.lower() == "linear16"
 DEEPGRAM_STT_MODEL = _optional("DEEPGRAM_STT_MODEL", "nova-3")
 
 TTS_LIVE_JSON_PATH = _optional("TTS_LIVE_JSON_PATH", "live_tts_captions.ndjson")
 LIVE_TRANSCRIPTION_PATH = _optional("LIVE_TRANSCRIPTION_PATH", "live_transcription.json")
 LIVE_TRANSCRIPTION_UPDATE_INTERVAL = float(_optional("LIVE_TRANSCRIPTION_UPDATE_INTERVAL", "2.0"))
+LIVE_TRANSCRIPTION_STREAMING = _optional("LIVE_TRANSCRIPTION_STREAMING", "false").lower() in ("1", "true", "yes")
 
-_cors = _optional("CORS_ALLOW_ORIGINS", "http://localhost:3000,http://localhost:5173")
-CORS_ALLOW_ORIGINS = [origin.strip() for origin in _cors.split(",") if origin.strip()] or ["*"]
+# Unset keeps the permissive "*" policy; an empty value allows no origins.
+_cors = _optional("CORS_ALLOW_ORIGINS", "*")
+CORS_ALLOW_ORIGINS = [origin for origin in map(str.strip, _cors.split(",")) if origin]
@@ -8,6 +8,13 @@ import re
 
 
 SCORE_PATTERN = re.compile(r"Score:\s*([1-5])", re.IGNORECASE)
+# One pass over the text: each section's score is the first "Score: N" after
+# the first mention of that section.
+_TOKEN_RE = re.compile(
+    r"(?P<code_cleanliness>Code\s*Cleanliness)|(?P<communication>Communication)"
+    r"|(?P<efficiency>Efficiency)|Score:\s*(?P<score>[1-5])",
+    re.IGNORECASE,
+)
 
 
 def parse_evaluation_scores(text: str) -> dict:
@@ -19,16 +26,19 @@ def parse_evaluation_scores(text: str) -> dict:
     if not text:
         return scores
 
-    cc = re.search(r"Code\s*Cleanliness[\s\S]*?Score:\s*([1-5])", text, re.IGNORECASE)
-    com = re.search(r"Communication[\s\S]*?Score:\s*([1-5])", text, re.IGNORECASE)
-    eff = re.search(r"Efficiency[\s\S]*?Score:\s*([1-5])", text, re.IGNORECASE)
-
-    if cc:
-        scores["code_cleanliness"] = int(cc.group(1))
-    if com:
-        scores["communication"] = int(com.group(1))
-    if eff:
-        scores["efficiency"] = int(eff.group(1))
+    seen: set[str] = set()
+    pending: list[str] = []
+    for match in _TOKEN_RE.finditer(text):
+        section = match.lastgroup
+        if section == "score":
+            for key in pending:
+                scores[key] = int(match.group("score"))
+            pending.clear()
+            if len(seen) == 3:
+                break
+        elif section not in seen:
+            seen.add(section)
+            pending.append(section)
     return scores
 
 
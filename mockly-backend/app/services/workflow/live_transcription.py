@@ -7,21 +7,99 @@ transcribing generated audio chunks and maintaining an updated JSON file.
 
 from __future__ import annotations
 
+import array
 import asyncio
-import json
 import logging
 import os
-import threading
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from io import BytesIO
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlencode
 
 import httpx
+import orjson
 
+from .clients import deepgram_http_client
 from .config import DEEPGRAM_API_KEY, DEEPGRAM_STT_MODEL
 
+try:
+    import av as _av  # PyAV ships with aiortc
+except Exception:  # pragma: no cover
+    _av = None
+
+# One worker so file replacements land in the order they were rendered.
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-transcription-io")
+
+# Speech recognition gains nothing above 16 kHz, so uploads are resampled to it.
+_STT_SAMPLE_RATE = 16000
+_STT_OPUS_BITRATE = 24000  # wideband speech quality
+
+_LISTEN_WS_URL = "wss://api.deepgram.com/v1/listen"
+# Deepgram drops an idle live socket after ~10s without audio.
+_KEEPALIVE_SECONDS = 5.0
+# Sent-but-unfinalized PCM kept for re-transcription if the socket drops;
+# Deepgram finalizes well within this window.
+_STREAM_TAIL_SECONDS = 10.0
+_KEEPALIVE_MSG = '{"type":"KeepAlive"}'
+_CLOSE_STREAM_MSG = '{"type":"CloseStream"}'
+
+
+# Peak int16 amplitude below which a PCM buffer counts as silence (~-54 dBFS).
+_SILENCE_PEAK = 64
+
+
+def _is_silent(pcm: bytes) -> bool:
+    """True when no little-endian int16 sample reaches _SILENCE_PEAK (C-speed min/max)."""
+    samples = array.array("h", pcm[: len(pcm) // 2 * 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return not samples or (max(samples) < _SILENCE_PEAK and min(samples) > -_SILENCE_PEAK)
+
+
+def _word_entries(words_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Map Deepgram word objects to the transcript's word/start_time/end_time entries."""
+    _round = round
+    return [
+        {
+            "word": w.get("word", ""),
+            "start_time": _round(w.get("start", 0.0), 3),
+            "end_time": _round(w.get("end", 0.0), 3),
+        }
+        for w in words_data
+    ]
+
+
+def _encode_ogg_opus(pcm: bytes, sample_rate: int) -> bytes | None:
+    """
+    Downsample mono 16-bit PCM to 16 kHz and compress it into Ogg/Opus so
+    transcription uploads are a small fraction of the raw size. Returns None
+    when encoding isn't possible, in which case callers send the raw PCM.
+    """
+    if _av is None or len(pcm) < 2:
+        return None
+    try:
+        frame = _av.AudioFrame(format="s16", layout="mono", samples=len(pcm) // 2)
+        frame.planes[0].update(pcm[: len(pcm) // 2 * 2])
+        frame.sample_rate = sample_rate
+        resampler = _av.AudioResampler(format="s16", layout="mono", rate=_STT_SAMPLE_RATE)
+        buf = BytesIO()
+        with _av.open(buf, "w", format="ogg") as out:
+            stream = out.add_stream("libopus", rate=_STT_SAMPLE_RATE, layout="mono")
+            stream.bit_rate = _STT_OPUS_BITRATE
+            for resampled in (*resampler.resample(frame), *resampler.resample(None)):
+                for packet in stream.encode(resampled):
+                    out.mux(packet)
+            for packet in stream.encode(None):
+                out.mux(packet)
+        return buf.getvalue()
+    except Exception as exc:
+        logging.warning("[LiveTranscription] Opus encode failed, sending raw PCM: %s", exc)
+        return None
+
 
 class LiveTranscriptionWriter:
     """
@@ -39,6 +117,9 @@ class LiveTranscriptionWriter:
         encoding: str = "linear16",
         update_interval_seconds: float = 2.0,
         min_audio_bytes: int = 192000,  # ~2 seconds at 48kHz 16-bit (was 96000)
+        max_audio_bytes: int = 512000,  # ~5.3 seconds at 48kHz 16-bit
+        max_latency_seconds: float = 6.0,
+        streaming: bool = False,
     ):
         """
         Initialize the live transcription writer.
@@ -50,40 +131,72 @@ class LiveTranscriptionWriter:
             update_interval_seconds: How often to update the JSON file
             min_audio_bytes: Minimum audio bytes before attempting transcription
                            (192000 bytes = ~2 seconds at 48kHz 16-bit)
+            max_audio_bytes: Transcribe as soon as this much audio is buffered,
+                           even if the update interval hasn't elapsed
+            max_latency_seconds: Transcribe whatever is buffered once the oldest
+                           buffered audio is this old, even below min_audio_bytes
+            streaming: Send PCM over one Deepgram live websocket and merge final
+                           results as they arrive instead of batching HTTP requests
         """
         self.output_path = Path(output_path)
         self.sample_rate = sample_rate
         self.encoding = encoding
         self.update_interval = update_interval_seconds
         self.min_audio_bytes = min_audio_bytes
+        self.max_audio_bytes = max_audio_bytes
+        self.max_latency = max_latency_seconds
+        # Integer-nanosecond copies for the per-tick flush gate
+        self._update_interval_ns = int(update_interval_seconds * 1e9)
+        self._max_latency_ns = int(max_latency_seconds * 1e9)
         
-        # Thread-safe state
-        self._lock = threading.Lock()
-        self._audio_buffer = BytesIO()
+        # State is only touched from the event loop (the TTS audio loop and
+        # the background update tasks), so no lock is needed
+        self._audio_buffer = bytearray()
         self._total_audio_duration_ms = 0.0
-        self._all_words: list[dict[str, Any]] = []
+        # Words are kept only in serialized form (comma-separated), so each
+        # update encodes just the new words and no per-word dicts are retained.
+        self._words_json = bytearray()
+        self._word_count = 0
         self._pending_text_chunks: list[str] = []
         
         # Timing
-        self._last_update_time = 0.0
+        self._last_update_ns = 0
+        self._buffer_started_ns = 0  # when the current buffer got its first chunk
         self._session_start = time.perf_counter()
+        # Resolved once; the buffer-growth log is checked on every audio chunk
+        self._debug_buffer = logging.getLogger().isEnabledFor(logging.DEBUG)
         
         # Background processing
         self._update_task: asyncio.Task | None = None
         self._should_stop = False
+        # Transcriptions run as background tasks so audio keeps flowing while
+        # Deepgram responds; at most two requests are in flight at once.
+        self._inflight: set[asyncio.Task] = set()
+        self._last_task: asyncio.Task | None = None
+        self._request_slots = asyncio.Semaphore(2)
+        
+        # Live websocket mode (raw PCM only); started on the first audio chunk
+        self.streaming = streaming and encoding.lower() in ("linear16", "pcm")
+        self._send_queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._stream_task: asyncio.Task | None = None
+        self._sent_tail = bytearray()  # most recently sent PCM
+        self._sent_tail_max = int(_STREAM_TAIL_SECONDS * sample_rate) * 2
+        self._sent_bytes = 0  # PCM bytes sent over the socket
+        self._final_bytes = 0  # stream offset Deepgram has finalized up to
         
         # Ensure output directory exists
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Initialize with empty transcription
-        self._write_json_file([])
+        self._write_json_file()
         
         logging.info(
             "[LiveTranscription] Initialized: output=%s, sample_rate=%d, "
-            "update_interval=%.1fs",
+            "update_interval=%.1fs, streaming=%s",
             output_path,
             sample_rate,
             update_interval_seconds,
+            self.streaming,
         )
 
     def add_audio_chunk(self, audio_bytes: bytes, duration_ms: float) -> None:
@@ -94,17 +207,25 @@ class LiveTranscriptionWriter:
             audio_bytes: Raw audio bytes (PCM 16-bit)
             duration_ms: Duration of this audio chunk in milliseconds
         """
-        with self._lock:
-            before_size = self._audio_buffer.tell()
-            self._audio_buffer.write(audio_bytes)
-            after_size = self._audio_buffer.tell()
+        if self.streaming:
+            if self._stream_task is None:
+                self._stream_task = asyncio.create_task(self._stream_words())
+            self._send_queue.put_nowait(bytes(audio_bytes))
             self._total_audio_duration_ms += duration_ms
-            
-            # Log periodically to track buffer growth
-            if after_size // 50000 != before_size // 50000:  # Log every ~50KB
+            return
+        if not self._audio_buffer:
+            self._buffer_started_ns = time.monotonic_ns()
+        self._audio_buffer.extend(audio_bytes)
+        self._total_audio_duration_ms += duration_ms
+        
+        # Log periodically to track buffer growth
+        if self._debug_buffer:
+            after_size = len(self._audio_buffer)
+            if after_size // 50000 != (after_size - len(audio_bytes)) // 50000:  # Log every ~50KB
                 logging.debug(
-                    f"[LiveTranscription] Buffer: {after_size} bytes "
-                    f"({self._total_audio_duration_ms/1000:.1f}s total audio)"
+                    "[LiveTranscription] Buffer: %d bytes (%.1fs total audio)",
+                    after_size,
+                    self._total_audio_duration_ms / 1000,
                 )
 
     def add_text_chunk(self, text: str) -> None:
@@ -114,8 +235,7 @@ class LiveTranscriptionWriter:
         Args:
             text: The text being converted to speech
         """
-        with self._lock:
-            self._pending_text_chunks.append(text)
+        self._pending_text_chunks.append(text)
 
     async def maybe_update(self) -> None:
         """
@@ -123,75 +243,228 @@ class LiveTranscriptionWriter:
         
         This should be called periodically from the main async loop.
         Will trigger transcription if enough time has passed and sufficient
-        audio has been accumulated.
+        audio has been accumulated. In streaming mode words are written as
+        Deepgram finalizes them, so there is nothing to do here.
         """
-        now = time.perf_counter()
+        if self.streaming:
+            return
+        now = time.monotonic_ns()
         
         # Check if we should update
-        with self._lock:
-            time_since_last = now - self._last_update_time
-            buffer_size = self._audio_buffer.tell()
-            
-            should_update = (
-                time_since_last >= self.update_interval
-                and buffer_size >= self.min_audio_bytes
-            )
-            
-            if not should_update:
-                # Log status periodically for debugging
-                if buffer_size > 0 and time_since_last >= self.update_interval:
-                    logging.debug(
-                        f"[LiveTranscription] Waiting for more audio: "
-                        f"{buffer_size} bytes (need {self.min_audio_bytes})"
-                    )
-                return
-            
-            # Extract audio for transcription
-            audio_data = self._audio_buffer.getvalue()
-            self._audio_buffer = BytesIO()  # Reset buffer
-            self._last_update_time = now
-            
-            logging.info(
-                f"[LiveTranscription] Triggering transcription: "
-                f"{len(audio_data)} bytes, {time_since_last:.1f}s since last update"
-            )
+        since_last_ns = now - self._last_update_ns
+        buffer_size = len(self._audio_buffer)
+        
+        # Size cap OR (interval AND minimum size) OR max latency, whichever first
+        should_update = (
+            buffer_size >= self.max_audio_bytes
+            or (since_last_ns >= self._update_interval_ns and buffer_size >= self.min_audio_bytes)
+            or (buffer_size > 0 and now - self._buffer_started_ns >= self._max_latency_ns)
+        )
+        
+        if not should_update:
+            # Log status periodically for debugging
+            if buffer_size > 0 and since_last_ns >= self._update_interval_ns:
+                logging.debug(
+                    f"[LiveTranscription] Waiting for more audio: "
+                    f"{buffer_size} bytes (need {self.min_audio_bytes})"
+                )
+            return
         
-        # Transcribe outside the lock
+        # Extract audio for transcription
+        audio_data = bytes(self._audio_buffer)
+        self._audio_buffer.clear()  # Reset buffer
+        self._last_update_ns = now
+        
+        logging.info(
+            f"[LiveTranscription] Triggering transcription: "
+            f"{len(audio_data)} bytes, {since_last_ns / 1e9:.1f}s since last update"
+        )
+        
+        # Transcribe in the background
+        task = asyncio.create_task(self._background_update(audio_data, self._last_task))
+        self._last_task = task
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _background_update(self, audio_data: bytes, previous: asyncio.Task | None) -> None:
         try:
-            await self._transcribe_and_update(audio_data)
+            await self._transcribe_and_update(audio_data, previous)
         except Exception as exc:
             logging.error(f"[LiveTranscription] Update failed: {exc}", exc_info=True)
 
-    async def _transcribe_and_update(self, audio_data: bytes) -> None:
+    async def _transcribe_and_update(self, audio_data: bytes, previous: asyncio.Task | None = None) -> None:
         """
         Transcribe audio data and update the JSON file.
         
         Args:
             audio_data: Raw audio bytes to transcribe
+            previous: The update for the preceding audio; its words are merged
+                first so the transcript stays in order
         """
         if not audio_data:
             return
         
         # Get word-level timestamps from Deepgram
-        word_timestamps = await self._get_word_timestamps(audio_data)
+        async with self._request_slots:
+            word_timestamps = await self._get_word_timestamps(audio_data)
+        if previous is not None:
+            await asyncio.wait((previous,))
         
         if not word_timestamps:
             logging.warning("[LiveTranscription] No words received from transcription")
             return
         
-        # Merge with existing words
-        with self._lock:
-            self._all_words.extend(word_timestamps)
-            
-            # Write updated JSON
-            self._write_json_file(self._all_words)
+        await self._merge_words(word_timestamps)
+
+    async def _merge_words(self, word_timestamps: list[dict[str, Any]]) -> None:
+        """Append words to the transcript and rewrite the JSON file."""
+        self._word_count += len(word_timestamps)
+        for word in word_timestamps:
+            if self._words_json:
+                self._words_json += b","
+            self._words_json += orjson.dumps(word)
+        raw = self._render_json()
+        
+        # Write updated JSON off the event loop
+        await asyncio.get_running_loop().run_in_executor(_IO_EXECUTOR, self._write_bytes, raw)
         
         logging.info(
             "[LiveTranscription] Updated with %d new words (total: %d)",
             len(word_timestamps),
-            len(self._all_words),
+            self._word_count,
         )
 
+    async def _stream_words(self) -> None:
+        """
+        Send queued PCM over a Deepgram live websocket and merge each final
+        result into the transcript. Falls back to batched HTTP transcription
+        if the socket can't be opened or drops mid-stream.
+        """
+        try:
+            import websockets  # type: ignore
+        except Exception as exc:  # pragma: no cover - optional dependency at runtime
+            logging.warning("[LiveTranscription] websockets unavailable, using batches: %s", exc)
+            self._fall_back_to_batches()
+            return
+
+        params = {
+            "model": DEEPGRAM_STT_MODEL,
+            "punctuate": "true",
+            "smart_format": "true",
+            "encoding": "linear16",
+            "sample_rate": str(self.sample_rate),
+            "channels": "1",
+        }
+        url = f"{_LISTEN_WS_URL}?{urlencode(params)}"
+        headers_dict = {"Authorization": f"Token {DEEPGRAM_API_KEY}"}
+        try:
+            connect_ctx = websockets.connect(url, additional_headers=headers_dict, max_size=None)  # type: ignore[call-arg]
+        except TypeError:
+            connect_ctx = websockets.connect(url, extra_headers=headers_dict, max_size=None)  # type: ignore[call-arg]
+
+        try:
+            async with connect_ctx as ws:
+                logging.info("[LiveTranscription] Streaming STT connected")
+                sender = asyncio.create_task(self._send_audio(ws))
+                try:
+                    async for message in ws:
+                        if isinstance(message, bytes):
+                            continue
+                        result = orjson.loads(message)
+                        self._note_finalized(result)
+                        words = self._final_words(result)
+                        if words:
+                            await self._merge_words(words)
+                finally:
+                    # The sender only finishes on its own after CloseStream
+                    dropped = not sender.done()
+                    sender.cancel()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logging.warning("[LiveTranscription] Streaming STT failed, using batches: %s", exc)
+            self._fall_back_to_batches()
+            return
+        if dropped and not self._should_stop:
+            logging.warning("[LiveTranscription] Streaming STT closed early, using batches")
+            self._fall_back_to_batches()
+
+    async def _send_audio(self, ws: Any) -> None:
+        """Forward queued PCM to the socket, coalescing whatever has piled up."""
+        queue = self._send_queue
+        while True:
+            try:
+                chunk = await asyncio.wait_for(queue.get(), _KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                await ws.send(_KEEPALIVE_MSG)
+                continue
+            if chunk is None:
+                await ws.send(_CLOSE_STREAM_MSG)
+                return
+            pending = [chunk]
+            while not queue.empty():
+                chunk = queue.get_nowait()
+                if chunk is None:
+                    await self._send_pcm(ws, b"".join(pending))
+                    await ws.send(_CLOSE_STREAM_MSG)
+                    return
+                pending.append(chunk)
+            await self._send_pcm(ws, b"".join(pending) if len(pending) > 1 else pending[0])
+
+    async def _send_pcm(self, ws: Any, pcm: bytes) -> None:
+        await ws.send(pcm)
+        self._sent_bytes += len(pcm)
+        self._sent_tail += pcm
+        excess = len(self._sent_tail) - self._sent_tail_max
+        if excess > 0:
+            del self._sent_tail[:excess]
+
+    def _note_finalized(self, message: dict[str, Any]) -> None:
+        """Advance the finalized stream offset from a final Results message."""
+        if message.get("type") != "Results" or not message.get("is_final"):
+            return
+        end = message.get("start", 0.0) + message.get("duration", 0.0)
+        self._final_bytes = max(self._final_bytes, int(end * self.sample_rate) * 2)
+
+    def _fall_back_to_batches(self) -> None:
+        """
+        Switch to HTTP batches. Audio Deepgram received but never finalized
+        (as far as the sent tail reaches) goes back into the buffer ahead of
+        the audio the socket never sent.
+        """
+        self.streaming = False
+        in_flight = max(self._sent_bytes - self._final_bytes, 0)
+        if in_flight:
+            recovered = min(in_flight, len(self._sent_tail))
+            logging.warning(
+                "[LiveTranscription] %d bytes of streamed audio were not finalized; "
+                "re-queueing %d bytes for batch transcription",
+                in_flight,
+                recovered,
+            )
+            if recovered:
+                self._audio_buffer[:0] = self._sent_tail[-recovered:]
+        self._sent_tail.clear()
+        if self._audio_buffer:
+            self._buffer_started_ns = time.monotonic_ns()
+        queue = self._send_queue
+        while not queue.empty():
+            chunk = queue.get_nowait()
+            if chunk:
+                if not self._audio_buffer:
+                    self._buffer_started_ns = time.monotonic_ns()
+                self._audio_buffer.extend(chunk)
+
+    @staticmethod
+    def _final_words(message: dict[str, Any]) -> list[dict[str, Any]]:
+        """Extract word timestamps from a final live Results message."""
+        if message.get("type") != "Results" or not message.get("is_final"):
+            return []
+        alternatives = message.get("channel", {}).get("alternatives", [])
+        if not alternatives:
+            return []
+        return _word_entries(alternatives[0].get("words", []))
+
     async def _get_word_timestamps(self, audio_data: bytes) -> list[dict[str, Any]]:
         """
         Transcribe audio and extract word-level timestamps.
@@ -212,7 +485,24 @@ class LiveTranscriptionWriter:
         # For raw PCM audio, use query parameters for encoding
         # This is the correct way to send raw audio to Deepgram
         # NOTE: All params must be strings for proper URL encoding
-        if self.encoding.lower() in ("linear16", "pcm"):
+        payload = audio_data
+        is_pcm = self.encoding.lower() in ("linear16", "pcm")
+        if is_pcm and await asyncio.to_thread(_is_silent, audio_data):
+            logging.info("[LiveTranscription] Skipping silent buffer (%d bytes)", len(audio_data))
+            return []
+        encoded = await asyncio.to_thread(_encode_ogg_opus, audio_data, self.sample_rate) if is_pcm else None
+        if encoded is not None:
+            # Containerized audio: Deepgram reads encoding and rate from the stream
+            logging.info(f"[LiveTranscription] Compressed to {len(encoded)} bytes of Ogg/Opus")
+            payload = encoded
+            content_type = "audio/ogg"
+            params = {
+                "model": DEEPGRAM_STT_MODEL,
+                "punctuate": "true",
+                "utterances": "false",
+                "smart_format": "true",
+            }
+        elif is_pcm:
             content_type = "audio/raw"
             params = {
                 "model": DEEPGRAM_STT_MODEL,
@@ -245,32 +535,31 @@ class LiveTranscriptionWriter:
         logging.info(f"[LiveTranscription] Content-Type: {content_type}")
         
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    url,
-                    params=params,
-                    headers=headers,
-                    content=audio_data,
-                )
-                
-                # Log response status for debugging
-                logging.info(f"[LiveTranscription] Deepgram response status: {response.status_code}")
-                
-                if response.status_code != 200:
-                    error_text = response.text
-                    logging.error(f"[LiveTranscription] Deepgram API error {response.status_code}: {error_text}")
-                    return []
-                
-                data = response.json()
-                
-                # DEBUG: Save response to file for inspection
+            response = await deepgram_http_client.post(
+                url,
+                params=params,
+                headers=headers,
+                content=payload,
+            )
+            
+            # Log response status for debugging
+            logging.info(f"[LiveTranscription] Deepgram response status: {response.status_code}")
+            
+            if response.status_code != 200:
+                error_text = response.text
+                logging.error(f"[LiveTranscription] Deepgram API error {response.status_code}: {error_text}")
+                return []
+            
+            data = orjson.loads(response.content)
+            
+            # DEBUG: Save response to file for inspection
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
                 try:
-                    with open("deepgram_response_debug.json", "w") as f:
-                        json.dump(data, f, indent=2)
-                    logging.info("[LiveTranscription] Saved Deepgram response to deepgram_response_debug.json")
+                    Path("deepgram_response_debug.json").write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                    logging.debug("[LiveTranscription] Saved Deepgram response to deepgram_response_debug.json")
                 except Exception:
                     pass
-                    
+                
         except httpx.HTTPStatusError as exc:
             logging.error(f"[LiveTranscription] HTTP error {exc.response.status_code}: {exc.response.text}")
             return []
@@ -286,13 +575,13 @@ class LiveTranscriptionWriter:
             
             if not channels:
                 logging.error("[LiveTranscription] No channels in Deepgram response")
-                logging.error(f"[LiveTranscription] Full response: {json.dumps(data, indent=2)}")
+                logging.debug("[LiveTranscription] Full response: %s", data)
                 return []
             
             alternatives = channels[0].get("alternatives", [])
             if not alternatives:
                 logging.error("[LiveTranscription] No alternatives in Deepgram response")
-                logging.error(f"[LiveTranscription] Full response: {json.dumps(data, indent=2)}")
+                logging.debug("[LiveTranscription] Full response: %s", data)
                 return []
             
             # Log the transcript to see if we got anything
@@ -309,45 +598,45 @@ class LiveTranscriptionWriter:
             if not words_data:
                 logging.warning("[LiveTranscription] No words in Deepgram response despite having transcript")
                 logging.warning(f"[LiveTranscription] Transcript was: '{transcript}'")
-                logging.debug(f"[LiveTranscription] Full response: {json.dumps(data, indent=2)}")
+                logging.debug("[LiveTranscription] Full response: %s", data)
                 return []
             
-            word_list = []
-            for word_obj in words_data:
-                word_list.append({
-                    "word": word_obj.get("word", ""),
-                    "start_time": round(word_obj.get("start", 0.0), 3),
-                    "end_time": round(word_obj.get("end", 0.0), 3),
-                })
+            word_list = _word_entries(words_data)
             
             logging.info(f"[LiveTranscription] Extracted {len(word_list)} words")
             return word_list
             
         except Exception as exc:
             logging.error(f"[LiveTranscription] Failed to parse words: {exc}", exc_info=True)
-            logging.debug(f"[LiveTranscription] Response data: {data}")
+            logging.debug("[LiveTranscription] Response data: %s", data)
             return []
 
-    def _write_json_file(self, words: list[dict[str, Any]]) -> None:
+    def _render_json(self) -> bytes:
+        """Assemble the JSON document from the already-serialized words."""
+        return b"".join((
+            b'{"transcription":[',
+            self._words_json,
+            b'],"last_updated":',
+            orjson.dumps(datetime.now(timezone.utc)),
+            b',"word_count":',
+            str(self._word_count).encode(),
+            b"}",
+        ))
+
+    def _write_json_file(self) -> None:
         """
         Write the transcription data to JSON file (thread-safe).
         
         Overwrites the entire file with the current transcription state.
-        
-        Args:
-            words: List of word dictionaries
         """
-        output_data = {
-            "transcription": words,
-            "last_updated": datetime.now(timezone.utc).isoformat(),
-            "word_count": len(words),
-        }
-        
+        self._write_bytes(self._render_json())
+
+    def _write_bytes(self, raw: bytes) -> None:
         try:
             # Write to temp file first, then atomic rename
             temp_path = self.output_path.with_suffix(".tmp")
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=2)
+            with open(temp_path, "wb") as f:
+                f.write(raw)
             
             # Atomic replacement to avoid partial reads
             temp_path.replace(self.output_path)
@@ -361,23 +650,36 @@ class LiveTranscriptionWriter:
         
         Call this when the TTS stream is complete.
         """
-        with self._lock:
-            remaining_audio = self._audio_buffer.getvalue()
-            self._audio_buffer = BytesIO()
+        if self._stream_task is not None:
+            self._send_queue.put_nowait(None)
+            try:
+                await asyncio.wait_for(asyncio.shield(self._stream_task), 10.0)
+            except asyncio.TimeoutError:
+                logging.warning("[LiveTranscription] Streaming STT did not close in time")
+            except Exception as exc:
+                logging.error("[LiveTranscription] Streaming STT failed: %s", exc)
+        remaining_audio = bytes(self._audio_buffer)
+        self._audio_buffer.clear()
         
         if remaining_audio:
             try:
-                await self._transcribe_and_update(remaining_audio)
+                await self._transcribe_and_update(remaining_audio, self._last_task)
             except Exception as exc:
                 logging.error("[LiveTranscription] Final update failed: %s", exc)
+        if self._inflight:
+            await asyncio.wait(set(self._inflight))
         
-        logging.info("[LiveTranscription] Finalized with %d total words", len(self._all_words))
+        logging.info("[LiveTranscription] Finalized with %d total words", self._word_count)
 
     def close(self) -> None:
         """Clean up resources."""
         self._should_stop = True
         if self._update_task and not self._update_task.done():
             self._update_task.cancel()
+        if self._stream_task and not self._stream_task.done():
+            self._stream_task.cancel()
+        for task in self._inflight:
+            task.cancel()
 
 
 __all__ = ["LiveTranscriptionWriter"]
@@ -4,91 +4,81 @@ Question formatting helpers and system prompt builder.
 
 from __future__ import annotations
 
+import functools
 from typing import Any
 
 
+def format_example(example: Any) -> str:
+    if not isinstance(example, dict):
+        return f"- {example}"
+    name = example.get("name") or example.get("title") or "example"
+    explanation = example.get("explanation")
+    note = f"\n  note: {explanation}" if explanation else ""
+    return f"- {name}:\n  input: {example.get('input')}\n  output: {example.get('output')}{note}"
+
+
 def _format_examples(examples: Any) -> str:
     if not examples:
         return ""
-
-    lines: list[str] = []
-    for example in examples:
-        if isinstance(example, dict):
-            name = example.get("name") or example.get("title") or "example"
-            inp = example.get("input")
-            out = example.get("output")
-            expl = example.get("explanation")
-            section = f"- {name}:\n  input: {inp}\n  output: {out}"
-            if expl:
-                section += f"\n  note: {expl}"
-            lines.append(section)
-        else:
-            lines.append(f"- {example}")
-    return "\n".join(lines)
+    return "\n".join(map(format_example, examples))
 
 
 def build_system_prompt_from_question(question: dict | None) -> str:
     """
     Construct the interviewer instructions using the supplied question metadata.
     """
-    if not isinstance(question, dict):
-        question = {}
+    if not isinstance(question, dict) or not question:
+        return _EMPTY_QUESTION_PROMPT
+    # Interview turns rebuild the prompt for the same question over and over.
+    try:
+        return _build_prompt_cached(tuple((field, freeze_value(question.get(field))) for field in PROMPT_FIELDS))
+    except TypeError:  # unhashable values (e.g. sets) in the question data
+        return _render_system_prompt(question)
 
-    title = (question.get("title") or "").strip()
-    difficulty = (question.get("difficulty") or "").strip()
-    statement = (question.get("statement") or question.get("prompt") or "").strip()
-    input_fmt = (question.get("input_format") or "").strip()
-    output_fmt = (question.get("output_format") or "").strip()
-    examples = _format_examples(question.get("examples"))
-    hints = question.get("hints") or []
 
-    hints_list: list[str] = []
-    if isinstance(hints, list):
-        hints_list = [str(h).strip() for h in hints if str(h).strip()]
-    elif str(hints).strip():
-        hints_list = [str(hints).strip()]
+# Only these keys feed the system prompt, so they form the cache key.
+PROMPT_FIELDS = ("title", "difficulty", "statement", "prompt", "input_format", "output_format", "examples", "hints")
 
-    limited_hints_text = "\n".join(f"- {hint}" for hint in hints_list[:2])
 
-    question_lines: list[str] = []
-    if title or difficulty:
-        header = []
-        if title:
-            header.append(f"Title: {title}")
-        if difficulty:
-            header.append(f"Difficulty: {difficulty}")
-        question_lines.append(" ".join(header))
-        question_lines.append("")
-    if statement:
-        question_lines.append("Problem Statement:")
-        question_lines.append(statement)
-        question_lines.append("")
-    if input_fmt:
-        question_lines.append("Input Format:")
-        question_lines.append(input_fmt)
-        question_lines.append("")
-    if output_fmt:
-        question_lines.append("Output Format:")
-        question_lines.append(output_fmt)
-        question_lines.append("")
-    if examples:
-        question_lines.append("Examples:")
-        question_lines.append(examples)
-        question_lines.append("")
-    if limited_hints_text:
-        question_lines.append("Hints (use at most two; ordered):")
-        question_lines.append(limited_hints_text)
-        question_lines.append("")
+def freeze_value(value: Any) -> Any:
+    # Hashable stand-in for question data that thaw_value turns back into an
+    # equal value; scalar types are kept so 1, 1.0 and True render differently.
+    if isinstance(value, dict):
+        return (dict, tuple((k, freeze_value(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list if isinstance(value, list) else tuple, tuple(freeze_value(v) for v in value))
+    return (type(value), value)
+
+
+def thaw_value(frozen: Any) -> Any:
+    kind, value = frozen
+    if kind is dict:
+        return {k: thaw_value(v) for k, v in value}
+    if kind is list or kind is tuple:
+        return kind(thaw_value(v) for v in value)
+    return value
+
 
-    question_details = "\n".join(filter(None, question_lines))
+@functools.lru_cache(maxsize=256)
+def _build_prompt_cached(key: tuple) -> str:
+    return _render_system_prompt({field: thaw_value(frozen) for field, frozen in key})
 
-    parts = [
+
+# Static instructions around the per-question details; the trailing/leading
+# "" supply the newlines that join the three pieces.
+_PROMPT_HEADER = "\n".join(
+    [
         "You will be acting as a technical interviewer conducting a coding interview with a candidate. "
         "You will present them with a LeetCode-style algorithmic problem and evaluate their performance.",
         "",
         "Here are the question details you should use:",
         "<question_details>",
-        question_details,
+        "",
+    ]
+)
+_PROMPT_FOOTER = "\n".join(
+    [
+        "",
         "</question_details>",
         "",
         "When I write BEGIN INTERVIEW, you will start the technical interview. "
@@ -167,45 +157,75 @@ def build_system_prompt_from_question(question: dict | None) -> str:
         "",
         "BEGIN INTERVIEW",
     ]
+)
 
-    return "\n".join(part for part in parts if part is not None)
+# With no question there are no details to render.
+_EMPTY_QUESTION_PROMPT = _PROMPT_HEADER + _PROMPT_FOOTER
 
 
-def build_code_evaluation_prompt(code: str, language: str, question: dict | None = None) -> str:
-    """
-    Construct an evaluation prompt that includes the candidate's code
-    and asks Claude to rate it based on the defined criteria.
-    """
-    if not isinstance(question, dict):
-        question = {}
-    
-    title = (question.get("title") or "").strip()
-    difficulty = (question.get("difficulty") or "").strip()
+# Plain text fields of the question details; statement has a prompt fallback.
+TEXT_FIELDS = ("title", "difficulty", "input_format", "output_format")
+
+
+def _render_system_prompt(question: dict) -> str:
+    title, difficulty, input_fmt, output_fmt = [(question.get(field) or "").strip() for field in TEXT_FIELDS]
     statement = (question.get("statement") or question.get("prompt") or "").strip()
-    
-    question_context = ""
-    if title or difficulty or statement:
-        question_parts = []
+    examples = _format_examples(question.get("examples"))
+    hints = question.get("hints") or []
+
+    if isinstance(hints, list):
+        hints_list = [hint for hint in (str(h).strip() for h in hints) if hint]
+    else:
+        hint = str(hints).strip()
+        hints_list = [hint] if hint else []
+
+    # At most two hints are offered, so format them directly.
+    if len(hints_list) >= 2:
+        limited_hints_text = f"- {hints_list[0]}\n- {hints_list[1]}"
+    elif hints_list:
+        limited_hints_text = f"- {hints_list[0]}"
+    else:
+        limited_hints_text = ""
+
+    # Label/value pairs, one per line; sections without content are skipped.
+    question_lines: list[str] = []
+    if title or difficulty:
+        header = []
         if title:
-            question_parts.append(f"Title: {title}")
+            header.append(f"Title: {title}")
         if difficulty:
-            question_parts.append(f"Difficulty: {difficulty}")
-        if statement:
-            question_parts.append(f"\nProblem Statement:\n{statement}")
-        question_context = "\n".join(question_parts)
-    
-    parts = [
+            header.append(f"Difficulty: {difficulty}")
+        question_lines.append(" ".join(header))
+    if statement:
+        question_lines += ("Problem Statement:", statement)
+    if input_fmt:
+        question_lines += ("Input Format:", input_fmt)
+    if output_fmt:
+        question_lines += ("Output Format:", output_fmt)
+    if examples:
+        question_lines += ("Examples:", examples)
+    if limited_hints_text:
+        question_lines += ("Hints (use at most two; ordered):", limited_hints_text)
+
+    question_details = "\n".join(question_lines)
+
+    return _PROMPT_HEADER + question_details + _PROMPT_FOOTER
+
+
+# Static text around the per-submission part of the evaluation prompt; the
+# trailing/leading "" supply the joining newlines.
+_EVAL_PROMPT_HEAD = "\n".join(
+    [
         "You are a technical interviewer evaluating a candidate's code submission for a coding interview.",
         "",
         "Here is the question the candidate was working on:",
         "<question>",
-        question_context or "A coding problem was presented to the candidate.",
-        "</question>",
         "",
-        f"The candidate wrote their solution in {language}. Here is their code:",
-        "<code>",
-        code,
-        "</code>",
+    ]
+)
+_EVAL_PROMPT_RUBRIC = "\n".join(
+    [
+        "",
         "",
         "Please evaluate this code submission based on the following criteria:",
         "",
@@ -256,5 +276,57 @@ def build_code_evaluation_prompt(code: str, language: str, question: dict | None
         "",
         "Be constructive, specific, and provide actionable feedback.",
     ]
+)
+
+
+def build_code_evaluation_prompt(code: str, language: str, question: dict | None = None) -> str:
+    """
+    Construct an evaluation prompt that includes the candidate's code
+    and asks Claude to rate it based on the defined criteria.
+    """
+    if not isinstance(question, dict):
+        question = {}
+    # Resubmitting unchanged code for the same question reuses the prompt.
+    return _build_evaluation_prompt_cached(
+        code,
+        language,
+        (question.get("title") or "").strip(),
+        (question.get("difficulty") or "").strip(),
+        (question.get("statement") or question.get("prompt") or "").strip(),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _build_evaluation_prompt_cached(code: str, language: str, title: str, difficulty: str, statement: str) -> str:
+    question_context = ""
+    if title or difficulty or statement:
+        question_parts = []
+        if title:
+            question_parts.append(f"Title: {title}")
+        if difficulty:
+            question_parts.append(f"Difficulty: {difficulty}")
+        if statement:
+            question_parts.append(f"\nProblem Statement:\n{statement}")
+        question_context = "\n".join(question_parts)
     
-    return "\n".join(part for part in parts if part is not None)
\ No newline at end of file
+    middle = [
+        question_context or "A coding problem was presented to the candidate.",
+        "</question>",
+        "",
+        f"The candidate wrote their solution in {language}. Here is their code:",
+        "<code>",
+        code,
+        "</code>",
+    ]
+    return _EVAL_PROMPT_HEAD + "\n".join([part for part in middle if part is not None]) + _EVAL_PROMPT_RUBRIC
+
+
+__all__ = [
+    "PROMPT_FIELDS",
+    "TEXT_FIELDS",
+    "build_code_evaluation_prompt",
+    "build_system_prompt_from_question",
+    "format_example",
+    "freeze_value",
+    "thaw_value",
+]
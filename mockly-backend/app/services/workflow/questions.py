@@ -4,49 +4,84 @@ Utilities for loading interview questions from questions.yaml.
 
 from __future__ import annotations
 
+import functools
+import os
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 try:
     import yaml as _yaml  # type: ignore
 except Exception:  # pragma: no cover
     _yaml = None
+else:
+    # Prefer the libyaml-backed loader when PyYAML was built with it.
+    _SafeLoader = getattr(_yaml, "CSafeLoader", _yaml.SafeLoader)
 
 
-def _project_root() -> Path:
-    # file -> workflow -> services -> app -> project-root
-    return Path(__file__).resolve().parents[3]
+# file -> workflow -> services -> app -> project-root; resolved once at import.
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_QUESTIONS_YAML_CANDIDATES = (_PROJECT_ROOT / "app" / "questions.yaml", _PROJECT_ROOT / "questions.yaml")
 
 
 def _find_questions_yaml() -> Path | None:
-    base = _project_root()
-    for candidate in [base / "app" / "questions.yaml", base / "questions.yaml"]:
+    for candidate in _QUESTIONS_YAML_CANDIDATES:
         if candidate.exists():
             return candidate
     return None
 
 
-def load_question_by_difficulty(difficulty: str) -> dict | None:
-    if not difficulty:
-        return None
+def load_questions_data(path: Path) -> dict:
+    """
+    Parse a questions.yaml file. A JSON sidecar next to the YAML skips the
+    YAML parser on later starts while it is at least as new as the YAML.
+    """
+    cache = path.with_suffix(".json")
+    try:
+        if cache.stat().st_mtime >= path.stat().st_mtime:
+            return orjson.loads(cache.read_bytes())
+    except (OSError, ValueError):
+        pass
     if _yaml is None:
         raise RuntimeError("PyYAML not installed; cannot load questions.yaml. Add PyYAML to requirements and install.")
+    with path.open("rb") as f:
+        data = _yaml.load(f, Loader=_SafeLoader) or {}
+    # Write-then-rename so concurrently starting workers never read half a file;
+    # a read-only checkout just keeps parsing the YAML.
+    tmp = cache.with_name(f".{cache.name}.{os.getpid()}")
+    try:
+        tmp.write_bytes(orjson.dumps(data))
+        os.replace(tmp, cache)
+    except (OSError, TypeError):
+        tmp.unlink(missing_ok=True)
+    return data
+
+
+@functools.cache
+def _first_problems() -> dict[str, dict | None]:
+    # difficulty -> its first problem, built from one parse of the file
     path = _find_questions_yaml()
     if not path:
         raise FileNotFoundError("questions.yaml not found under app/ or project root.")
 
-    data = _yaml.safe_load(path.read_text(encoding="utf-8")) or {}
-    difficulties = data.get("difficulties") or []
-    target = str(difficulty).strip().lower()
-    for entry in difficulties:
-        if str(entry.get("difficulty", "")).strip().lower() == target:
-            problems = entry.get("problems") or []
-            if problems:
-                question = dict(problems[0])
-                question.setdefault("difficulty", difficulty)
-                return question
-            break
-    return None
+    index: dict[str, dict | None] = {}
+    for entry in load_questions_data(path).get("difficulties") or []:
+        problems = entry.get("problems") or []
+        index.setdefault(str(entry.get("difficulty", "")).strip().lower(), problems[0] if problems else None)
+    return index
+
+
+def load_question_by_difficulty(difficulty: str) -> dict | None:
+    if not difficulty:
+        return None
+    # The YAML is parsed once for all difficulties; callers get their own copy.
+    problem = _first_problems().get(str(difficulty).strip().lower())
+    if problem is None:
+        return None
+    question = dict(problem)
+    question.setdefault("difficulty", difficulty)
+    return question
 
 
-__all__ = ["load_question_by_difficulty"]
+__all__ = ["load_question_by_difficulty", "load_questions_data"]
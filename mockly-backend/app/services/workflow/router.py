@@ -10,7 +10,7 @@ from typing import AsyncIterator
 from fastapi import APIRouter, Body, HTTPException, Request
 from fastapi.responses import Response, StreamingResponse
 
-from .claude import stream_claude_text
+from .claude import stream_claude_text, stream_claude_text_async
 from .clients import anthropic_client, deepgram_client as dg
 from .config import (
     ANTHROPIC_MODEL,
@@ -70,13 +70,11 @@ async def type_streaming(payload: dict = Body(...)):
         try:
             # Step 1: Fully generate Claude's response first
             claude_start = time.perf_counter()
-            tokens = stream_claude_text(user_text, system_override=system)
+            tokens = stream_claude_text_async(user_text, system_override=system)
             logging.info(f"[/type/stream] Claude stream initiated after {(time.perf_counter() - claude_start)*1000:.1f}ms")
             
-            # Collect ALL tokens from Claude first
-            all_tokens = []
-            for token in tokens:
-                all_tokens.append(token)
+            # Collect ALL tokens from Claude first (read off the event loop)
+            all_tokens = [token async for token in tokens]
             
             full_text = "".join(all_tokens)
             claude_elapsed = time.perf_counter() - claude_start
@@ -361,11 +359,9 @@ def input_stream(payload: dict = Body(...)):
 
         logging.info(f"[/input/stream] Processing {mode} mode request")
         
-        # Collect all tokens from Claude first
-        tokens = stream_claude_text(user_text, system_override=system)
-        all_tokens = []
-        for token in tokens:
-            all_tokens.append(token)
+        # Collect all tokens from Claude first (read off the event loop)
+        tokens = stream_claude_text_async(user_text, system_override=system)
+        all_tokens = [token async for token in tokens]
         
         full_text = "".join(all_tokens)
         logging.info(f"[/input/stream] Claude generated {len(full_text)} characters")
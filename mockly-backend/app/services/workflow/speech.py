@@ -4,20 +4,25 @@ Text post-processing utilities for the TTS pipeline.
 
 from __future__ import annotations
 
+import logging
 import re
 import time
 from typing import Iterable
 
 
+# Terminal punctuation followed by whitespace, matched against the last two
+# buffered characters.
+_SENTENCE_END = re.compile(r"[.!?]\s")
+
+
 def sentence_chunks(token_iter: Iterable[str], min_chars: int = 24, first_flush_ms: int = 900) -> Iterable[str]:
     """
     Chunk streamed tokens into sentence-like fragments to reduce TTS latency.
     """
-    import logging
-    
-    buffer: list[str] = []
-    buffer_len = 0
-    first_started_at: float | None = None
+    # A single-owner str grows in place with +=, so no per-token join.
+    buffer = ""
+    first_started_at: int | None = None
+    first_flush_ns = first_flush_ms * 1_000_000
     first_chunk_sent = False
     total_tokens_received = 0
 
@@ -25,30 +30,30 @@ def sentence_chunks(token_iter: Iterable[str], min_chars: int = 24, first_flush_
         total_tokens_received += 1
         
         if first_started_at is None:
-            first_started_at = time.perf_counter()
+            first_started_at = time.perf_counter_ns()
 
-        buffer.append(token)
-        buffer_len += len(token)
-        joined = "".join(buffer)
+        buffer += token
 
-        if re.search(r"[.!?]\s$", joined) or "\n" in joined or buffer_len >= min_chars:
-            out = joined.strip()
+        # Any newline flushes right away, so only the new token can hold one.
+        if _SENTENCE_END.fullmatch(buffer[-2:]) or "\n" in token or len(buffer) >= min_chars:
+            out = buffer.strip()
             if out:
                 yield out
                 first_chunk_sent = True
-            buffer, buffer_len, first_started_at = [], 0, None
+            buffer, first_started_at = "", None
             continue
 
         if not first_chunk_sent and first_started_at is not None:
-            elapsed_ms = (time.perf_counter() - first_started_at) * 1000.0
-            if elapsed_ms >= first_flush_ms and joined.strip():
-                yield joined.strip()
-                buffer, buffer_len, first_started_at = [], 0, None
-                first_chunk_sent = True
+            if time.perf_counter_ns() - first_started_at >= first_flush_ns:
+                out = buffer.strip()
+                if out:
+                    yield out
+                    buffer, first_started_at = "", None
+                    first_chunk_sent = True
 
     # Flush any remaining buffer
     if buffer:
-        out = "".join(buffer).strip()
+        out = buffer.strip()
         if out:
             logging.info(f"[sentence_chunks] Flushing final buffer: {len(out)} chars")
             yield out
@@ -56,6 +61,28 @@ def sentence_chunks(token_iter: Iterable[str], min_chars: int = 24, first_flush_
     logging.info(f"[sentence_chunks] Processed {total_tokens_received} tokens total")
 
 
+# sanitize_for_tts runs once per streamed sentence, so its patterns are
+# compiled up front.
+_CODE_BLOCK_RE = re.compile(r"```[^`]*```", re.DOTALL)
+_FENCE_RE = re.compile(r"```+")
+_INLINE_CODE_RE = re.compile(r"`[^`]+`")
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+", re.M)
+_TAG_RE = re.compile(r"</?[^>\n]+>")
+_BULLET_RE = re.compile(r"^\s*[-*•]\s+", re.M)
+_NUMBERED_RE = re.compile(r"^\s*\d+\.\s+", re.M)
+_SYMBOL_RE = re.compile(r"[&@#$%^+=<>|\\~/]")
+_DOTS_RE = re.compile(r"\.{2,}")
+_BANGS_RE = re.compile(r"\!{2,}")
+_QUESTION_MARKS_RE = re.compile(r"\?{2,}")
+_SPACES_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*\n+")
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([.,!?:;])")
+_BRACKETS_TABLE = str.maketrans("", "", "[]{}()")
+# Anything one of the rewrites below could touch. Sentences with none of it
+# (most of them) only need stripping.
+_NEEDS_SANITIZE_RE = re.compile(r"[`*_#<>\[\]{}()=\-!+&@$%^|\\~/•]|\.\.|\?\?|\s[\s.,!?:;]|[^\S ]|^\s*\d+\.\s")
+
+
 def sanitize_for_tts(text: str) -> str:
     """
     Aggressively sanitize text for TTS, removing code syntax and special characters
@@ -63,35 +90,34 @@ def sanitize_for_tts(text: str) -> str:
     """
     if not text:
         return ""
+    if not _NEEDS_SANITIZE_RE.search(text):
+        return text.strip()
     
     # Log original text for debugging
-    import logging
     original_text = text[:200] if len(text) > 200 else text
     
     # Remove code blocks entirely (including content)
-    text = re.sub(r"```[^`]*```", "", text, flags=re.DOTALL)
-    text = re.sub(r"```+", "", text)
+    text = _CODE_BLOCK_RE.sub("", text)
+    text = _FENCE_RE.sub("", text)
     
     # Remove inline code
-    text = re.sub(r"`[^`]+`", "", text)
+    text = _INLINE_CODE_RE.sub("", text)
     text = text.replace("`", "")
     
     # Remove markdown formatting
     text = text.replace("**", "").replace("__", "").replace("*", "")
-    text = re.sub(r"^\s{0,3}#{1,6}\s+", "", text, flags=re.M)
+    text = _HEADING_RE.sub("", text)
     
     # Remove XML/HTML-like tags
-    text = re.sub(r"</?[^>\n]+>", "", text)
+    text = _TAG_RE.sub("", text)
     
     # Remove list markers
-    text = re.sub(r"^\s*[-*•]\s+", "", text, flags=re.M)
-    text = re.sub(r"^\s*\d+\.\s+", "", text, flags=re.M)
+    text = _BULLET_RE.sub("", text)
+    text = _NUMBERED_RE.sub("", text)
     
     # Remove/replace code syntax characters that confuse TTS
     # Remove brackets and braces (but keep content)
-    text = text.replace("[", "").replace("]", "")
-    text = text.replace("{", "").replace("}", "")
-    text = text.replace("(", "").replace(")", "")
+    text = text.translate(_BRACKETS_TABLE)
     
     # Remove programming symbols
     text = text.replace("=>", " ")
@@ -104,7 +130,7 @@ def sanitize_for_tts(text: str) -> str:
     text = text.replace("--", " minus minus ")
     
     # Remove other special characters (keep basic punctuation: . , ! ? : ; ' " -)
-    text = re.sub(r"[&@#$%^+=<>|\\~/]", " ", text)
+    text = _SYMBOL_RE.sub(" ", text)
     
     # Remove underscores (often in variable names)
     text = text.replace("_", " ")
@@ -114,14 +140,14 @@ def sanitize_for_tts(text: str) -> str:
     text = text.replace("'", "'").replace("'", "'")
     
     # Remove excessive punctuation
-    text = re.sub(r"\.{2,}", ".", text)  # Multiple dots -> single dot
-    text = re.sub(r"\!{2,}", "!", text)
-    text = re.sub(r"\?{2,}", "?", text)
+    text = _DOTS_RE.sub(".", text)  # Multiple dots -> single dot
+    text = _BANGS_RE.sub("!", text)
+    text = _QUESTION_MARKS_RE.sub("?", text)
     
     # Clean up whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)  # Max 2 newlines
-    text = re.sub(r"\s+([.,!?:;])", r"\1", text)  # Remove space before punctuation
+    text = _SPACES_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)  # Max 2 newlines
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r"\1", text)  # Remove space before punctuation
     
     result = text.strip()
     
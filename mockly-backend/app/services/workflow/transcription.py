@@ -10,8 +10,7 @@ from __future__ import annotations
 
 import logging
 
-import httpx
-
+from .clients import deepgram_http_client
 from .config import DEEPGRAM_API_KEY, DEEPGRAM_STT_MODEL
 
 
@@ -22,10 +21,9 @@ async def transcribe_prerecorded_deepgram(audio_bytes: bytes, content_type: str
     }
     params = {"model": DEEPGRAM_STT_MODEL}
     url = "https://api.deepgram.com/v1/listen"
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.post(url, params=params, headers=headers, content=audio_bytes)
-        response.raise_for_status()
-        data = response.json()
+    response = await deepgram_http_client.post(url, params=params, headers=headers, content=audio_bytes)
+    response.raise_for_status()
+    data = response.json()
     try:
         return data["results"]["channels"][0]["alternatives"][0]["transcript"]
     except Exception:
@@ -60,10 +58,11 @@ async def transcribe_prerecorded_deepgram_detailed(
         "smart_format": smart_format,
     }
     url = "https://api.deepgram.com/v1/listen"
-    async with httpx.AsyncClient(timeout=60) as client:
-        response = await client.post(url, params=params, headers=headers, content=audio_bytes)
-        response.raise_for_status()
-        data = response.json()
+    response = await deepgram_http_client.post(
+        url, params=params, headers=headers, content=audio_bytes, timeout=60
+    )
+    response.raise_for_status()
+    data = response.json()
 
     results = data.get("results") or {}
     # Minimal validation: ensure the shape contains either utterances or channels.
@@ -8,6 +8,7 @@ import asyncio
 import contextlib
 import json
 import logging
+import threading
 import time
 from typing import AsyncIterator, Iterable
 
@@ -18,12 +19,14 @@ from .config import (
     DEEPGRAM_API_KEY,
     DEEPGRAM_SAMPLE_RATE,
     DEEPGRAM_STREAM_ENCODING,
+    DEEPGRAM_STREAM_IS_LINEAR16,
     DEEPGRAM_TTS_VOICE,
 )
 from .speech import sanitize_for_tts
 from .config import (
     TTS_LIVE_JSON_PATH,
     LIVE_TRANSCRIPTION_PATH,
+    LIVE_TRANSCRIPTION_STREAMING,
     LIVE_TRANSCRIPTION_UPDATE_INTERVAL,
 )
 from .captions import LiveTTSCapture
@@ -37,9 +40,10 @@ async def _send_chunks_via_ws(
     transcription: LiveTranscriptionWriter | None = None,
 ) -> None:
     """
-    Send sanitized Speak messages over the Deepgram websocket, flushing
-    periodically to keep latency low.
+    Send sanitized text over the Deepgram websocket, batching queued
+    sentences into one Speak message per flush to keep latency low.
     """
+    pending: list[str] = []
     try:
         FLUSH_CHARS = 220
         FLUSH_MS = 650
@@ -48,20 +52,22 @@ async def _send_chunks_via_ws(
 
         if hasattr(sentences, "__aiter__"):
             async for sentence in sentences:  # type: ignore[attr-defined]
-                pending_chars = _send_sentence(ws, sentence, pending_chars, capture, transcription)
+                pending_chars = _queue_sentence(pending, sentence, pending_chars, capture, transcription)
                 last_flush, pending_chars = _maybe_flush(
-                    ws, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
+                    ws, pending, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
                 )
                 await asyncio.sleep(0)
         else:
             for sentence in sentences:  # type: ignore
-                pending_chars = _send_sentence(ws, sentence, pending_chars, capture, transcription)
+                pending_chars = _queue_sentence(pending, sentence, pending_chars, capture, transcription)
                 last_flush, pending_chars = _maybe_flush(
-                    ws, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
+                    ws, pending, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
                 )
                 await asyncio.sleep(0)
     finally:
         with contextlib.suppress(Exception):
+            if pending:
+                _send_speak(ws, pending)
             ws.send_text(json.dumps({"type": "Flush"}))
             if capture:
                 capture.flush()
@@ -75,19 +81,18 @@ async def _send_chunks_via_ws(
             transcription.close()
 
 
-def _send_sentence(
-    ws,
+def _queue_sentence(
+    pending: list[str],
     sentence,
     pending_chars: int,
     capture: LiveTTSCapture | None = None,
     transcription: LiveTranscriptionWriter | None = None,
 ) -> int:
-    """Send sentence via Deepgram SDK websocket (uses send_text method)"""
+    """Sanitize a sentence and queue it for the next batched Speak message."""
     clean = sanitize_for_tts(str(sentence)).strip()
     if not clean:
         return pending_chars
-    ws.send_text(json.dumps({"type": "Speak", "text": clean}))
-    logging.info("[Deepgram WS] SENT Speak: %r", clean[:120])
+    pending.append(clean)
     if capture:
         capture.speak(clean)
     if transcription:
@@ -95,31 +100,29 @@ def _send_sentence(
     return pending_chars + len(clean)
 
 
-async def _send_sentence_raw(
-    ws,
-    sentence,
-    pending_chars: int,
-    capture: LiveTTSCapture | None = None,
-    transcription: LiveTranscriptionWriter | None = None,
-) -> int:
-    """Send sentence via raw websockets library (uses send method)"""
-    send_start = time.perf_counter()
-    clean = sanitize_for_tts(str(sentence)).strip()
-    if not clean:
-        logging.info("[Deepgram WS raw] SKIP empty after sanitize: %r", sentence[:80])
-        return pending_chars
-    await ws.send(json.dumps({"type": "Speak", "text": clean}))
-    send_time = (time.perf_counter() - send_start) * 1000
-    logging.info("[Deepgram WS raw] SENT Speak (%d chars in %.1fms): %r", len(clean), send_time, clean[:120])
-    if capture:
-        capture.speak(clean)
-    if transcription:
-        transcription.add_text_chunk(clean)
-    return pending_chars + len(clean)
+def _speak_message(pending: list[str]) -> str:
+    message = json.dumps({"type": "Speak", "text": " ".join(pending)})
+    pending.clear()
+    return message
+
+
+def _send_speak(ws, pending: list[str]) -> None:
+    """Send queued sentences as one Speak via Deepgram SDK websocket (send_text)"""
+    count = len(pending)
+    ws.send_text(_speak_message(pending))
+    logging.info("[Deepgram WS] SENT Speak (%d sentences)", count)
+
+
+async def _send_speak_raw(ws, pending: list[str]) -> None:
+    """Send queued sentences as one Speak via raw websockets (send)"""
+    count = len(pending)
+    await ws.send(_speak_message(pending))
+    logging.info("[Deepgram WS raw] SENT Speak (%d sentences)", count)
 
 
 def _maybe_flush(
     ws,
+    pending: list[str],
     pending_chars: int,
     last_flush: float,
     flush_chars: int,
@@ -129,6 +132,8 @@ def _maybe_flush(
     """Maybe flush Deepgram SDK websocket (uses send_text method)"""
     now = time.perf_counter()
     if pending_chars >= flush_chars or (now - last_flush) * 1000.0 >= flush_ms:
+        if pending:
+            _send_speak(ws, pending)
         ws.send_text(json.dumps({"type": "Flush"}))
         logging.info("[Deepgram WS] SENT Flush")
         if capture:
@@ -139,6 +144,7 @@ def _maybe_flush(
 
 async def _maybe_flush_raw(
     ws,
+    pending: list[str],
     pending_chars: int,
     last_flush: float,
     flush_chars: int,
@@ -148,6 +154,8 @@ async def _maybe_flush_raw(
     """Maybe flush raw websockets (uses send method)"""
     now = time.perf_counter()
     if pending_chars >= flush_chars or (now - last_flush) * 1000.0 >= flush_ms:
+        if pending:
+            await _send_speak_raw(ws, pending)
         await ws.send(json.dumps({"type": "Flush"}))
         logging.info("[Deepgram WS raw] SENT Flush")
         if capture:
@@ -156,15 +164,77 @@ async def _maybe_flush_raw(
     return last_flush, pending_chars
 
 
+# Max queued audio batches between the Deepgram listener and the consumer.
+TTS_FRAME_QUEUE_SIZE = 64
+
+
+class FramePump:
+    """
+    Hand audio frames from the Deepgram listener thread to the event loop.
+    Frames that arrive before the loop gets around to draining are coalesced
+    into one bytes object, so a burst costs one wakeup and one queue put.
+    If the queue is bounded and full (a stalled consumer), the oldest queued
+    audio is dropped rather than letting memory grow.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+        self._loop = loop
+        self._queue = queue
+        self._lock = threading.Lock()
+        self._buf = bytearray()
+        self.dropped_frames = 0
+
+    def push(self, frame: bytes | bytearray | memoryview) -> None:
+        with self._lock:
+            schedule = not self._buf
+            self._buf += frame
+        if schedule:
+            self._loop.call_soon_threadsafe(self._drain)
+
+    def _drain(self) -> None:
+        with self._lock:
+            frame = bytes(self._buf)
+            self._buf.clear()
+        if not frame:
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped_frames += 1
+        self._queue.put_nowait(frame)
+
+
+async def frames_until_closed(queue: asyncio.Queue, closed: asyncio.Event) -> AsyncIterator[bytes]:
+    """
+    Yield queued audio frames until the websocket closes, then drain the rest.
+    Races the queue against the close event instead of polling on a timeout.
+    """
+    closer = asyncio.ensure_future(closed.wait())
+    getter: asyncio.Future | None = None
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait((getter, closer), return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                break
+            yield getter.result()
+        while not queue.empty():
+            yield queue.get_nowait()
+    finally:
+        closer.cancel()
+        if getter is not None:
+            getter.cancel()
+
+
 def _pcm_duration_ms(nbytes: int, sample_rate: int) -> float:
     # linear16, 1 channel -> 2 bytes per sample
     return (nbytes / (2.0 * max(sample_rate, 1))) * 1000.0
 
 
 async def stream_deepgram_tts(sentences) -> AsyncIterator[bytes]:
-    queue: asyncio.Queue[bytes] = asyncio.Queue()
-    closed = {"flag": False}
-    saw_audio = {"flag": False}
+    queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=TTS_FRAME_QUEUE_SIZE)
+    loop = asyncio.get_running_loop()
+    closed = asyncio.Event()
+    saw_audio = False
     capture: LiveTTSCapture | None = None
     transcription: LiveTranscriptionWriter | None = None
     
@@ -190,6 +260,7 @@ async def stream_deepgram_tts(sentences) -> AsyncIterator[bytes]:
                 sample_rate=DEEPGRAM_SAMPLE_RATE,
                 encoding=str(DEEPGRAM_STREAM_ENCODING),
                 update_interval_seconds=LIVE_TRANSCRIPTION_UPDATE_INTERVAL,
+                streaming=LIVE_TRANSCRIPTION_STREAMING,
             )
             logging.info(f"[Deepgram TTS] ✅ Live transcription ENABLED: path={LIVE_TRANSCRIPTION_PATH}, encoding={DEEPGRAM_STREAM_ENCODING}")
         except Exception as exc:
@@ -198,18 +269,20 @@ async def stream_deepgram_tts(sentences) -> AsyncIterator[bytes]:
     else:
         logging.warning("[Deepgram TTS] Live transcription DISABLED: LIVE_TRANSCRIPTION_PATH not set")
 
+    pump = FramePump(loop, queue)
+
     def on_message(msg):
+        nonlocal saw_audio
+        # Runs on the Deepgram listener thread, not the event loop.
         if isinstance(msg, (bytes, bytearray)):
-            saw_audio["flag"] = True
-            frame = bytes(msg)
-            queue.put_nowait(frame)
+            saw_audio = True
+            pump.push(msg)
             return
         mtype = getattr(msg, "type", None) or getattr(msg, "_type", None)
         data = getattr(msg, "data", None)
         if str(mtype).lower() == "audio" and isinstance(data, (bytes, bytearray)):
-            saw_audio["flag"] = True
-            frame = bytes(data)
-            queue.put_nowait(frame)
+            saw_audio = True
+            pump.push(data)
             return
         logging.info("[Deepgram WS] non-audio: %r", msg)
 
@@ -222,46 +295,40 @@ async def stream_deepgram_tts(sentences) -> AsyncIterator[bytes]:
         ws.on(EventType.MESSAGE, on_message)
         ws.on(
             EventType.CLOSE,
-            lambda _: (closed.update({"flag": True}), logging.info("[Deepgram WS] CLOSE")),
+            lambda _: (loop.call_soon_threadsafe(closed.set), logging.info("[Deepgram WS] CLOSE")),
         )
         ws.on(EventType.ERROR, lambda exc: logging.error("[Deepgram WS] ERROR: %s", exc))
         ws.start_listening()
 
         send_task = asyncio.create_task(_send_chunks_via_ws(ws, sentences, capture, transcription))
 
-        last_audio = time.perf_counter()
         total = 0
-        while True:
-            try:
-                frame = await asyncio.wait_for(queue.get(), timeout=10.0)
-                total += len(frame)
-                duration_ms = _pcm_duration_ms(total, DEEPGRAM_SAMPLE_RATE)
-                
-                if capture and str(DEEPGRAM_STREAM_ENCODING).lower() == "linear16":
-                    capture.audio(len(frame), duration_ms)
-                
-                # Add audio to transcription buffer
-                if transcription and str(DEEPGRAM_STREAM_ENCODING).lower() == "linear16":
-                    transcription.add_audio_chunk(frame, _pcm_duration_ms(len(frame), DEEPGRAM_SAMPLE_RATE))
-                    # Periodically trigger transcription update
-                    await transcription.maybe_update()
-                
-                if total // 32768 != (total - len(frame)) // 32768:
-                    logging.info("[Deepgram WS] audio %.1f KiB", total / 1024)
-                yield frame
-                last_audio = time.perf_counter()
-            except asyncio.TimeoutError:
-                # Only break if connection is closed AND no audio for 10 seconds
-                if closed["flag"] and (time.perf_counter() - last_audio) > 10.0:
-                    logging.info("[Deepgram WS] Stream ended after 10s idle")
-                    break
+        async for frame in frames_until_closed(queue, closed):
+            total += len(frame)
+            duration_ms = _pcm_duration_ms(total, DEEPGRAM_SAMPLE_RATE)
+            
+            if capture and DEEPGRAM_STREAM_IS_LINEAR16:
+                capture.audio(len(frame), duration_ms)
+            
+            # Add audio to transcription buffer
+            if transcription and DEEPGRAM_STREAM_IS_LINEAR16:
+                transcription.add_audio_chunk(frame, _pcm_duration_ms(len(frame), DEEPGRAM_SAMPLE_RATE))
+                # Periodically trigger transcription update
+                await transcription.maybe_update()
+            
+            if total // 32768 != (total - len(frame)) // 32768:
+                logging.info("[Deepgram WS] audio %.1f KiB", total / 1024)
+            yield frame
+        logging.info("[Deepgram WS] Stream ended (socket closed)")
+        if pump.dropped_frames:
+            logging.warning("[Deepgram WS] dropped %d queued audio frames (slow consumer)", pump.dropped_frames)
 
         if not send_task.done():
             send_task.cancel()
             with contextlib.suppress(Exception):
                 await send_task
 
-    if not saw_audio["flag"]:
+    if not saw_audio:
         logging.warning("[Deepgram WS] no audio frames were received")
 
 
@@ -333,6 +400,7 @@ async def stream_deepgram_tts_raw(sentences: Iterable[str]) -> AsyncIterator[byt
                 sample_rate=DEEPGRAM_SAMPLE_RATE,
                 encoding=str(DEEPGRAM_STREAM_ENCODING),
                 update_interval_seconds=LIVE_TRANSCRIPTION_UPDATE_INTERVAL,
+                streaming=LIVE_TRANSCRIPTION_STREAMING,
             )
             logging.info(f"[Deepgram TTS raw] ✅ Live transcription ENABLED: path={LIVE_TRANSCRIPTION_PATH}, encoding={DEEPGRAM_STREAM_ENCODING}")
         except Exception as exc:
@@ -348,6 +416,7 @@ async def stream_deepgram_tts_raw(sentences: Iterable[str]) -> AsyncIterator[byt
             FLUSH_CHARS = 220
             FLUSH_MS = 650
             last_flush = time.perf_counter()
+            pending: list[str] = []
             pending_chars = 0
             sentence_count = 0
             try:
@@ -355,24 +424,26 @@ async def stream_deepgram_tts_raw(sentences: Iterable[str]) -> AsyncIterator[byt
                     async for sentence in sentences:  # type: ignore[attr-defined]
                         sentence_count += 1
                         logging.info(f"[Deepgram TTS raw] Processing sentence {sentence_count}: {sentence[:80]}...")
-                        pending_chars = await _send_sentence_raw(ws, sentence, pending_chars, capture, transcription)
+                        pending_chars = _queue_sentence(pending, sentence, pending_chars, capture, transcription)
                         last_flush, pending_chars = await _maybe_flush_raw(
-                            ws, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
+                            ws, pending, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
                         )
                         await asyncio.sleep(0)
                 else:
                     for sentence in sentences:  # type: ignore
                         sentence_count += 1
                         logging.info(f"[Deepgram TTS raw] Processing sentence {sentence_count}: {sentence[:80]}...")
-                        pending_chars = await _send_sentence_raw(ws, sentence, pending_chars, capture, transcription)
+                        pending_chars = _queue_sentence(pending, sentence, pending_chars, capture, transcription)
                         last_flush, pending_chars = await _maybe_flush_raw(
-                            ws, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
+                            ws, pending, pending_chars, last_flush, FLUSH_CHARS, FLUSH_MS, capture
                         )
                         await asyncio.sleep(0)
                 
                 # Final flush to ensure all text is sent
                 if pending_chars > 0:
                     logging.info(f"[Deepgram TTS raw] Final flush with {pending_chars} pending chars")
+                    if pending:
+                        await _send_speak_raw(ws, pending)
                     await ws.send(json.dumps({"type": "Flush"}))
                     if capture:
                         capture.flush()
@@ -425,18 +496,18 @@ async def stream_deepgram_tts_raw(sentences: Iterable[str]) -> AsyncIterator[byt
                     if audio_chunks_received % 10 == 0:
                         logging.info(f"[Deepgram TTS raw] Received {audio_chunks_received} audio chunks, {total} bytes total, last gap: {gap_since_last:.3f}s")
                     
-                    if capture and str(DEEPGRAM_STREAM_ENCODING).lower() == "linear16":
+                    if capture and DEEPGRAM_STREAM_IS_LINEAR16:
                         capture.audio(len(frame), duration_ms)
                     
                     # Add audio to transcription buffer
-                    if transcription and str(DEEPGRAM_STREAM_ENCODING).lower() == "linear16":
+                    if transcription and DEEPGRAM_STREAM_IS_LINEAR16:
                         transcription.add_audio_chunk(frame, _pcm_duration_ms(len(frame), DEEPGRAM_SAMPLE_RATE))
                         # Periodically trigger transcription update
                         await transcription.maybe_update()
                     elif audio_chunks_received == 1:  # Log once at start
                         if not transcription:
                             logging.warning("[Deepgram TTS raw] Transcription not initialized - check LIVE_TRANSCRIPTION_PATH")
-                        elif str(DEEPGRAM_STREAM_ENCODING).lower() != "linear16":
+                        elif not DEEPGRAM_STREAM_IS_LINEAR16:
                             logging.warning(f"[Deepgram TTS raw] Wrong encoding for transcription: {DEEPGRAM_STREAM_ENCODING} (need linear16)")
                     
                     yield frame
@@ -468,4 +539,10 @@ async def stream_deepgram_tts_raw(sentences: Iterable[str]) -> AsyncIterator[byt
                     await send_task
 
 
-__all__ = ["stream_deepgram_tts", "stream_deepgram_tts_raw"]
+__all__ = [
+    "TTS_FRAME_QUEUE_SIZE",
+    "FramePump",
+    "frames_until_closed",
+    "stream_deepgram_tts",
+    "stream_deepgram_tts_raw",
+]